@@ -0,0 +1,75 @@
+import threading
+import time
+from typing import List, Dict, Optional
+
+from genetic_algorithm_V5 import Agent, Meeting, Logbook, SearchProgress, run_scheduling_algorithm
+
+
+class BackgroundSolve:
+    # Runs run_scheduling_algorithm on a worker thread. The page polls `status()` and may call
+    # `cancel()`; a cancelled solve still finishes with the best schedule found so far.
+    def __init__(self, agents: List[Agent], meetings: List[Meeting], **solver_options):
+        self.agents = agents
+        self.meetings = meetings
+        self.solver_options = solver_options
+        self.logbook = solver_options.setdefault('logbook', Logbook())
+        self.progress: Optional[SearchProgress] = None
+        self.result: Optional[Dict[Meeting, Agent]] = None
+        self.error: Optional[BaseException] = None
+        self.started = None
+        self.finished = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="schedule-solver", daemon=True)
+
+    def start(self) -> 'BackgroundSolve':
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def _on_generation(self, progress: SearchProgress) -> bool:
+        self.progress = progress
+        return self._cancel.is_set()
+
+    def _run(self):
+        try:
+            self.result = run_scheduling_algorithm(self.agents, self.meetings, callback=self._on_generation,
+                                                   **self.solver_options)
+        except BaseException as error:
+            self.error = error
+        finally:
+            self.finished = time.perf_counter()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def status(self) -> Dict[str, Optional[float]]:
+        progress = self.progress
+        elapsed = (self.finished or time.perf_counter()) - self.started if self.started else 0.0
+        status = dict(generation=None, best_fitness=None, elapsed=elapsed, fraction=None, eta=None)
+        if progress is None:
+            return status
+
+        status['generation'] = progress.generation
+        status['best_fitness'] = progress.best_fitness
+        # The tightest of the configured limits decides how far along the solve is
+        fractions = []
+        time_limit = self.solver_options.get('time_limit')
+        if time_limit:
+            fractions.append(elapsed / time_limit)
+        generations = self.solver_options.get('generations', 100)
+        if generations:
+            fractions.append(progress.generation / generations)
+        if fractions:
+            fraction = min(1.0, max(fractions))
+            status['fraction'] = fraction
+            if fraction > 0:
+                status['eta'] = max(0.0, elapsed / fraction - elapsed)
+        return status
@@ -0,0 +1,154 @@
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional
+
+from genetic_algorithm_V5 import Agent, Meeting, fitness, run_scheduling_algorithm
+from meeting_io_V5 import read_meetings, write_schedule
+from result_cache_V5 import ResultCache
+
+# Headless batch runs: no Streamlit or Plotly is imported on this path.
+#
+#   python batch_run_V5.py meetings.csv --seeds 0-99 --workers 4 --output runs/
+#   python batch_run_V5.py meetings.parquet --scenarios scenarios.json --agents agents.json
+#
+# A scenarios file is a JSON list of objects with a "name" and run_scheduling_algorithm keyword
+# arguments, e.g. [{"name": "long", "generations": 500}]. An agents file is a JSON list of
+# {"id": ..., "skills": [...]} objects.
+
+# The agents of the Schedule Generation page
+DEFAULT_AGENTS = [
+    {"id": 0, "skills": ["Fire", "Maintenance"]},
+    {"id": 1, "skills": ["Security"]},
+    {"id": 2, "skills": ["Fire"]},
+    {"id": 3, "skills": ["Security", "Maintenance"]},
+    {"id": 4, "skills": ["Security", "Fire"]},
+]
+
+METRIC_FIELDS = ["scenario", "seed", "fitness", "meetings", "assigned", "unassigned", "night_assigned",
+                 "max_agent_hours", "min_agent_hours", "seconds", "output"]
+
+# Set once per worker process by `_init_worker`
+_WORKER_JOB = None
+
+
+def parse_seeds(values: List[str]) -> List[int]:
+    # Accepts single seeds and inclusive ranges such as 0-99
+    seeds = []
+    for value in values:
+        first, _, last = value.partition("-")
+        seeds.extend(range(int(first), int(last) + 1) if last else [int(first)])
+    return seeds
+
+
+def schedule_metrics(schedule: Dict[Meeting, Agent], agents: List[Agent], meetings: List[Meeting]) -> Dict:
+    hours = {agent.id: 0.0 for agent in agents}
+    for meeting, agent in schedule.items():
+        hours[agent.id] += (meeting.end - meeting.start).total_seconds() / 3600
+    return {
+        "fitness": fitness(schedule, agents),
+        "meetings": len(meetings),
+        "assigned": len(schedule),
+        "unassigned": len(meetings) - len(schedule),
+        "night_assigned": sum(1 for meeting in schedule if meeting.is_night),
+        "max_agent_hours": round(max(hours.values(), default=0.0), 2),
+        "min_agent_hours": round(min(hours.values(), default=0.0), 2),
+    }
+
+
+def _file_stem(name: str) -> str:
+    # Scenario names are free text; keep only characters that are safe in a file name
+    return re.sub(r"[^A-Za-z0-9._-]", "_", name).strip(".") or "scenario"
+
+
+def _init_worker(dataset: str, agents: List[Dict], cache_dir: Optional[str], output: str, output_format: str,
+                 result_cache: Optional[str]):
+    # The dataset is parsed (or memory-mapped from the cache) once per process, not once per run
+    global _WORKER_JOB
+    store = read_meetings(dataset, cache_dir=cache_dir)
+    _WORKER_JOB = dict(agents=[Agent(a["id"], a["skills"]) for a in agents], meetings=store.meetings(),
+                       output=output, format=output_format,
+                       result_cache=ResultCache(result_cache) if result_cache else None)
+
+
+def _run_job(scenario: Dict, stem: str, seed: int) -> Dict:
+    job = _WORKER_JOB
+    options = {key: value for key, value in scenario.items() if key != "name"}
+    started = time.perf_counter()
+    schedule = run_scheduling_algorithm(job["agents"], job["meetings"], seed=seed,
+                                        result_cache=job["result_cache"], **options)
+    seconds = time.perf_counter() - started
+
+    path = os.path.join(job["output"], f"{stem}_seed{seed}.{job['format']}")
+    write_schedule(schedule, path, job["format"], meetings=job["meetings"])
+    return dict(scenario=scenario["name"], seed=seed, seconds=round(seconds, 3), output=path,
+                **schedule_metrics(schedule, job["agents"], job["meetings"]))
+
+
+def run_batch(dataset: str, scenarios: List[Dict], seeds: List[int], output: str, agents: List[Dict] = None,
+              workers: Optional[int] = None, output_format: str = "csv", cache_dir: Optional[str] = None,
+              result_cache: Optional[str] = None) -> List[Dict]:
+    os.makedirs(output, exist_ok=True)
+    initargs = (dataset, agents or DEFAULT_AGENTS, cache_dir, output, output_format, result_cache)
+    # The scenario's position keeps file names unique when names repeat or sanitize alike
+    jobs = [(scenario, f"{i}_{_file_stem(scenario['name'])}", seed)
+            for i, scenario in enumerate(scenarios) for seed in seeds]
+    if workers == 1:
+        _init_worker(*initargs)
+        results = [_run_job(*job) for job in jobs]
+    else:
+        if cache_dir is not None:
+            # Fill the dataset cache once up front, so the workers only memory-map it instead of
+            # all parsing the file and writing the same cache entry
+            read_meetings(dataset, cache_dir=cache_dir)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+            results = list(executor.map(_run_job, *zip(*jobs)))
+
+    with open(os.path.join(output, "metrics.json"), "w") as f:
+        json.dump(results, f, indent=2)
+    with open(os.path.join(output, "metrics.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=METRIC_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the scheduler over many scenarios and seeds without the UI")
+    parser.add_argument("dataset", help="meetings file (.csv or .parquet)")
+    parser.add_argument("--agents", help="JSON file of agents (default: the Schedule Generation page's agents)")
+    parser.add_argument("--scenarios", help="JSON file of named run_scheduling_algorithm option sets")
+    parser.add_argument("--seeds", nargs="+", default=["0"], help="seeds or ranges such as 0-99 (default 0)")
+    parser.add_argument("--workers", type=int, help="parallel runs (default: one per CPU, 1 runs in-process)")
+    parser.add_argument("--output", default="batch_output", help="directory for schedules and metrics")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="schedule file format")
+    parser.add_argument("--cache-dir", default=".meeting_cache", help="parsed dataset cache ('' to disable)")
+    parser.add_argument("--result-cache", help="directory of the solved-schedule cache (default: none)")
+    args = parser.parse_args(argv)
+
+    agents = None
+    if args.agents:
+        with open(args.agents) as f:
+            agents = json.load(f)
+    scenarios = [{"name": "default"}]
+    if args.scenarios:
+        with open(args.scenarios) as f:
+            scenarios = json.load(f)
+        for i, scenario in enumerate(scenarios):
+            scenario.setdefault("name", f"scenario{i}")
+
+    results = run_batch(args.dataset, scenarios, parse_seeds(args.seeds), args.output, agents, args.workers,
+                        args.format, args.cache_dir or None, args.result_cache)
+    for result in results:
+        print(f"{result['scenario']} seed {result['seed']}: fitness {result['fitness']:.1f}, "
+              f"{result['unassigned']} unassigned, {result['seconds']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import argparse
+import datetime
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+import genetic_algorithm_V5 as ga
+from benchmarks.workload import generate_workload, generate_shift_roster, generate_shift_schedule
+from utils_V5 import calculate_metrics
+
+# Workload size and GA settings per tier; `repeats` is the number of timed runs per benchmark
+TIERS = {
+    "small": dict(agents=5, meetings=200, days=7, pop_size=20, generations=10, repeats=5),
+    "medium": dict(agents=50, meetings=2000, days=14, pop_size=50, generations=10, repeats=3),
+    "large": dict(agents=300, meetings=10000, days=28, pop_size=50, generations=5, repeats=1),
+}
+
+
+def _benchmarks(tier: dict, seed: int) -> Dict[str, Tuple[Callable[[], tuple], Callable]]:
+    agents, meetings = generate_workload(tier["agents"], tier["meetings"], tier["days"], seed=seed)
+    day_meetings = [m for m in meetings if not m.is_night]
+    random.seed(seed)
+    population = ga.initialize_population(2, agents, day_meetings)
+    problem = ga.SchedulingProblem(agents, day_meetings)
+    genomes = np.stack(ga.initialize_genomes(tier["pop_size"], problem))
+    roster = generate_shift_roster(tier["agents"], seed=seed)
+
+    return {
+        "fitness": (lambda: (population[0], agents), ga.fitness),
+        "batch_fitness": (lambda: (genomes, problem), ga.batch_fitness),
+        "crossover": (lambda: (population[0], population[1]), ga.crossover),
+        "mutate": (lambda: (dict(population[0]), agents, 0.1), ga.mutate),
+        "initialize_population": (lambda: (tier["pop_size"], agents, day_meetings), ga.initialize_population),
+        "assign_night_shifts": (lambda: (agents, meetings), ga.assign_night_shifts),
+        "genetic_algorithm": (lambda: (agents, day_meetings, tier["pop_size"], tier["generations"], 0.1),
+                              ga.genetic_algorithm),
+        # The production path: vectorized scoring, greedy seeding, batched crossover and elite repair,
+        # run for the full generation count instead of stopping at a perfect score
+        "run_scheduling_algorithm": (lambda: (agents, meetings, tier["pop_size"], tier["generations"]),
+                                     partial(ga.run_scheduling_algorithm, target_fitness=None)),
+        "calculate_metrics": (lambda: (generate_shift_schedule(tier["days"], seed=seed, agents=roster), roster),
+                              calculate_metrics),
+    }
+
+
+def run_benchmarks(tier_name: str, seed: int = 0, only: List[str] = None) -> dict:
+    tier = TIERS[tier_name]
+    results = {}
+    for name, (setup, function) in _benchmarks(tier, seed).items():
+        if only and name not in only:
+            continue
+        timings = []
+        for repeat in range(tier["repeats"]):
+            args = setup()
+            random.seed(seed + repeat)
+            started = time.perf_counter()
+            function(*args)
+            timings.append(time.perf_counter() - started)
+        results[name] = {"min": min(timings), "median": statistics.median(timings), "repeats": len(timings)}
+        print(f"{tier_name:>6} {name:<24} min {results[name]['min']:.6f}s  median {results[name]['median']:.6f}s")
+
+    return {
+        "tier": tier_name,
+        "seed": seed,
+        "workload": tier,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[str]:
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["median"]
+        after = result["median"]
+        ratio = after / before if before else float("inf")
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:<24} {before:.6f}s -> {after:.6f}s  x{ratio:.2f} {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Timed benchmarks for the scheduling solver")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run a tier and optionally save a JSON baseline")
+    run_parser.add_argument("--tier", choices=TIERS, default="small")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--only", nargs="*", help="benchmark names to run")
+    run_parser.add_argument("--output", help="path of the JSON results file")
+
+    compare_parser = commands.add_parser("compare", help="flag benchmarks slower than a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2,
+                                help="allowed slowdown of the median as a fraction (default 0.2)")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        report = run_benchmarks(args.tier, args.seed, args.only)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    if baseline["tier"] != current["tier"]:
+        print(f"Warning: comparing tier {baseline['tier']} against {current['tier']}")
+    return 1 if compare(baseline, current, args.threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
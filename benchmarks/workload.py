@@ -0,0 +1,86 @@
+import datetime
+import random
+from typing import List, Dict, Tuple, Optional
+
+from genetic_algorithm_V5 import Agent, Meeting
+
+# Meeting types and durations (hours) as used by the Meeting Management page
+MEETING_DURATIONS = {
+    "Maintenance": 1,
+    "FireTest": 2,
+    "Security": 3,
+    "Monitoring": 2
+}
+
+AGENT_SKILLS = ["Fire", "Security", "Maintenance"]
+
+NIGHT_TYPES = ["Security", "Monitoring"]
+
+
+def generate_agents(num_agents: int, rng: random.Random, skill_probability: float = 0.5) -> List[Agent]:
+    return [Agent(i, [skill for skill in AGENT_SKILLS if rng.random() < skill_probability])
+            for i in range(num_agents)]
+
+
+def generate_meetings(num_meetings: int, num_days: int, rng: random.Random,
+                      skill_mix: Optional[Dict[str, float]] = None, night_ratio: float = 0.1,
+                      start_date: datetime.date = datetime.date(2024, 1, 1)) -> List[Meeting]:
+    skill_mix = skill_mix or {meeting_type: 1.0 for meeting_type in MEETING_DURATIONS}
+    day_types, day_weights = zip(*skill_mix.items())
+    night_weights = [skill_mix.get(meeting_type, 0.0) for meeting_type in NIGHT_TYPES]
+    if not any(night_weights):
+        night_weights = [1.0] * len(NIGHT_TYPES)
+
+    meetings = []
+    for _ in range(num_meetings):
+        day = start_date + datetime.timedelta(days=rng.randrange(num_days))
+        is_night = rng.random() < night_ratio
+        if is_night:
+            meeting_type = rng.choices(NIGHT_TYPES, night_weights)[0]
+            start_hour = rng.randint(20, 23) if meeting_type == "Security" else rng.randint(22, 23)
+        else:
+            meeting_type = rng.choices(day_types, day_weights)[0]
+            start_hour = rng.randint(8, 19)
+        start = datetime.datetime.combine(day, datetime.time(hour=start_hour))
+        end = start + datetime.timedelta(hours=MEETING_DURATIONS.get(meeting_type, 1))
+        meetings.append(Meeting(start, end, meeting_type, is_night))
+    meetings.sort(key=lambda m: m.start)
+    return meetings
+
+
+def generate_workload(num_agents: int, num_meetings: int, num_days: int, seed: int = 0,
+                      skill_mix: Optional[Dict[str, float]] = None, night_ratio: float = 0.1,
+                      skill_probability: float = 0.5) -> Tuple[List[Agent], List[Meeting]]:
+    rng = random.Random(seed)
+    agents = generate_agents(num_agents, rng, skill_probability)
+    meetings = generate_meetings(num_meetings, num_days, rng, skill_mix, night_ratio)
+    return agents, meetings
+
+
+def generate_shift_roster(num_agents: int, seed: int = 0, skill_probability: float = 0.5) -> Dict[str, List[str]]:
+    # An {agent: [skills]} roster in the shape of utils_V5.AGENTS
+    rng = random.Random(seed)
+    return {f"Agent{i + 1}": [skill for skill in AGENT_SKILLS if rng.random() < skill_probability]
+            for i in range(num_agents)}
+
+
+def generate_shift_schedule(num_days: int, seed: int = 0, appointments_per_day: int = 3,
+                            agents: Optional[Dict[str, List[str]]] = None) -> List[Dict[str, List[Tuple[str, int]]]]:
+    # Day-by-day {agent: [(shift or appointment, hours)]} lists in the shape `utils_V5.calculate_metrics`
+    # reads, for the `agents` roster (utils_V5.AGENTS by default)
+    from utils_V5 import AGENTS, APPOINTMENT_TYPES
+
+    rng = random.Random(seed)
+    schedule = []
+    for _ in range(num_days):
+        day_schedule = {}
+        for agent in (agents if agents is not None else AGENTS):
+            if rng.random() < 0.2:
+                day_schedule[agent] = [("Night1", 1), ("Night2", 3), ("Night3", 2), ("Night4", 1)]
+            else:
+                shifts = [(rng.choice(["Morning", "Afternoon"]), 8)]
+                shifts += [(rng.choice(APPOINTMENT_TYPES), rng.randint(1, 3))
+                           for _ in range(rng.randint(0, appointments_per_day))]
+                day_schedule[agent] = shifts
+        schedule.append(day_schedule)
+    return schedule
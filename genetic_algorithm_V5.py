@@ -1,9 +1,31 @@
 import random
-from typing import List, Dict, Tuple
+import bisect
+import csv
+import io
+import json
+import hashlib
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Optional, Callable, Iterable, Iterator, Union, TYPE_CHECKING
 import datetime
 
+import numpy as np
+
+if TYPE_CHECKING:
+    from result_cache_V5 import ResultCache
+
+
+# Genomes are uint16 vectors of agent indices, one slot per meeting position
+GENOME_DTYPE = np.uint16
+UNASSIGNED = np.iinfo(GENOME_DTYPE).max
+
 
 class Agent:
+    __slots__ = ('id', 'skills', 'schedule')
+
     def __init__(self, id: int, skills: List[str]):
         self.id = id
         self.skills = skills
@@ -11,6 +33,8 @@ class Agent:
 
 
 class Meeting:
+    __slots__ = ('start', 'end', 'required_skill', 'is_night')
+
     def __init__(self, start: datetime.datetime, end: datetime.datetime, required_skill: str, is_night: bool):
         self.start = start
         self.end = end
@@ -18,51 +42,341 @@ class Meeting:
         self.is_night = is_night
 
 
-def initialize_population(pop_size: int, agents: List[Agent], meetings: List[Meeting]) -> List[Dict[Meeting, Agent]]:
+class SkillIndex:
+    # Eligible agents per required skill for one agent roster, filled lazily per skill
+    def __init__(self, agents: List[Agent]):
+        self.agents = agents
+        self._indices = {}  # {skill: [agent indices]}
+        self._agents = {}  # {skill: [agents]}
+        self._sets = {}  # {skill: {agents}}
+
+    def _build(self, skill: str):
+        indices = [i for i, agent in enumerate(self.agents) if skill in agent.skills or skill == 'Monitoring']
+        self._indices[skill] = indices
+        self._agents[skill] = [self.agents[i] for i in indices]
+        self._sets[skill] = set(self._agents[skill])
+
+    def eligible(self, skill: str) -> List[Agent]:
+        if skill not in self._agents:
+            self._build(skill)
+        return self._agents[skill]
+
+    def eligible_indices(self, skill: str) -> List[int]:
+        if skill not in self._indices:
+            self._build(skill)
+        return self._indices[skill]
+
+    def is_eligible(self, skill: str, agent: Agent) -> bool:
+        if skill not in self._sets:
+            self._build(skill)
+        return agent in self._sets[skill]
+
+
+class SchedulingProblem:
+    # Static per-run arrays shared by the genome operators and the fitness engines. Meetings and
+    # agents are addressed by their position in the lists passed in.
+    def __init__(self, agents: List[Agent], meetings: List[Meeting], skill_index: Optional[SkillIndex] = None):
+        self.agents = agents
+        self.meetings = meetings
+        self.agent_index = {agent: i for i, agent in enumerate(agents)}
+        self.skill_index = skill_index if skill_index is not None else SkillIndex(agents)
+        if len(agents) >= UNASSIGNED:
+            raise ValueError(f"At most {UNASSIGNED - 1} agents fit in a genome")
+        self.eligible = [self.skill_index.eligible_indices(m.required_skill) for m in meetings]
+        # Positions that can hold an agent; the rest stay UNASSIGNED in every genome
+        self.assigned = np.array([i for i, eligible in enumerate(self.eligible) if eligible], dtype=np.intp)
+        # Positions mutation may touch; narrowed by `restrict_to_repair` for warm starts
+        self.mutable = self.assigned
+        # Eligible agents as a padded table, so replacements can be drawn for a whole population
+        self.eligible_counts = np.array([len(eligible) for eligible in self.eligible], dtype=np.intp)
+        self.eligible_table = np.zeros((len(meetings), max(1, self.eligible_counts.max(initial=0))),
+                                       dtype=GENOME_DTYPE)
+        for i, eligible in enumerate(self.eligible):
+            self.eligible_table[i, :len(eligible)] = eligible
+
+        origin = min((m.start for m in meetings), default=datetime.datetime(1970, 1, 1))
+        first_day = origin.date().toordinal()
+        # Timestamps in microseconds so `.seconds` semantics can be reproduced exactly
+        self.starts = np.array([(m.start - origin) // datetime.timedelta(microseconds=1) for m in meetings],
+                               dtype=np.int64)
+        self.ends = np.array([(m.end - origin) // datetime.timedelta(microseconds=1) for m in meetings],
+                             dtype=np.int64)
+        self.durations = np.array([(m.end - m.start).seconds for m in meetings], dtype=np.int64)
+        self.days = np.array([m.start.date().toordinal() - first_day for m in meetings], dtype=np.int64)
+        self.num_days = int(self.days.max()) + 1 if meetings else 0
+        skills = sorted({m.required_skill for m in meetings})
+        skill_codes = {skill: code for code, skill in enumerate(skills)}
+        skill_rows = np.zeros((len(skills), len(agents)), dtype=bool)
+        for code, skill in enumerate(skills):
+            skill_rows[code, self.skill_index.eligible_indices(skill)] = True
+        self.skill_ok = skill_rows[np.array([skill_codes[m.required_skill] for m in meetings], dtype=np.intp)]
+        self._fingerprint = None
+
+    @property
+    def fingerprint(self) -> bytes:
+        # Digest of everything the fitness engines read, so equal fingerprints mean equal scores
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=32)
+            for array in (self.starts, self.ends, self.durations, self.days, self.skill_ok):
+                digest.update(repr(array.shape).encode())
+                digest.update(np.ascontiguousarray(array).tobytes())
+            self._fingerprint = digest.digest()
+        return self._fingerprint
+
+    def restrict_to_repair(self, seed: np.ndarray):
+        # Warm start: only meetings on the days that gained unseeded meetings stay mutable
+        unseeded = self.assigned[seed[self.assigned] == UNASSIGNED]
+        self.mutable = self.assigned[np.isin(self.days[self.assigned], self.days[unseeded])]
+
+    def encode(self, schedule: Dict[Meeting, Agent]) -> np.ndarray:
+        return np.fromiter((self.agent_index[schedule[m]] if m in schedule else UNASSIGNED for m in self.meetings),
+                           dtype=GENOME_DTYPE, count=len(self.meetings))
+
+    def decode(self, genome: np.ndarray) -> Dict[Meeting, Agent]:
+        # Back to the {Meeting: Agent} form the pages work with
+        return {self.meetings[i]: self.agents[a] for i, a in enumerate(genome.tolist()) if a != UNASSIGNED}
+
+    def encode_population(self, population: List[Dict[Meeting, Agent]]) -> np.ndarray:
+        matrix = np.empty((len(population), len(self.meetings)), dtype=GENOME_DTYPE)
+        for row, schedule in enumerate(population):
+            matrix[row] = self.encode(schedule)
+        return matrix
+
+
+# Upper bound on (individual, meeting) cells scored at once, to keep temporaries small
+_BATCH_CELLS = 1 << 20
+
+# Minimum break between consecutive meetings (microseconds) and maximum daily work time
+# (seconds) that `fitness` leaves unpenalized
+_MIN_BREAK_US = 1800 * 1_000_000
+_MAX_WORK_SECONDS = 8 * 3600
+
+# Every engine sums penalties as integers in units of 1/360 of a point (one unit per second of
+# overtime, which costs 10 points an hour) and divides once, so scores are identical whatever
+# the order the penalties are added in and whatever the meeting durations
+_UNITS_PER_POINT = 360
+_SKILL_UNITS = 100 * _UNITS_PER_POINT
+_OVERLAP_UNITS = 50 * _UNITS_PER_POINT
+_BREAK_UNITS = 25 * _UNITS_PER_POINT
+
+
+def batch_fitness(population: np.ndarray, problem: SchedulingProblem) -> np.ndarray:
+    population = np.atleast_2d(np.asarray(population))
+    scores = np.zeros(len(population), dtype=np.float64)
+    rows_per_chunk = max(1, _BATCH_CELLS // max(1, population.shape[1]))
+    for lo in range(0, len(population), rows_per_chunk):
+        scores[lo:lo + rows_per_chunk] = _batch_fitness_chunk(population[lo:lo + rows_per_chunk], problem)
+    return scores
+
+
+def _batch_fitness_chunk(population: np.ndarray, problem: SchedulingProblem) -> np.ndarray:
+    n = len(population)
+    rows, cols = np.nonzero(population != UNASSIGNED)
+    if len(rows) == 0:
+        return np.zeros(n)
+    agent = population[rows, cols].astype(np.int64)
+
+    penalty = _SKILL_UNITS * np.bincount(rows[~problem.skill_ok[cols, agent]], minlength=n)
+
+    # One (individual, agent, date) bucket per key; lexsort is stable, so ties on start keep
+    # meeting order exactly like the sorted() call in `fitness`
+    bucket = (rows * len(problem.agents) + agent) * max(1, problem.num_days) + problem.days[cols]
+    order = np.lexsort((problem.starts[cols], bucket))
+    bucket = bucket[order]
+    row = rows[order]
+    start = problem.starts[cols][order]
+    end = problem.ends[cols][order]
+    same = bucket[1:] == bucket[:-1]
+
+    # Overlaps: one searchsorted pass over consecutive bucket ids, linear in the bucket sizes
+    dense = np.concatenate(([0], np.cumsum(~same)))
+    penalty += _OVERLAP_UNITS * _count_overlaps(dense, row, start, end, n)
+
+    # Breaks: timedelta.seconds wraps negative gaps into [0, 86400)
+    gap = (start[1:] - end[:-1]) // 1_000_000 % 86400
+    penalty += _BREAK_UNITS * np.bincount(row[1:][same & (gap < 1800)], minlength=n)
+
+    # Work time: integer seconds per bucket, one unit per second over 8 hours
+    firsts = np.flatnonzero(np.concatenate(([True], ~same)))
+    overtime = np.maximum(np.add.reduceat(problem.durations[cols][order], firsts) - _MAX_WORK_SECONDS, 0)
+    penalty += np.bincount(row[firsts], weights=overtime, minlength=n).astype(np.int64)
+
+    return -penalty / _UNITS_PER_POINT
+
+
+def _count_overlaps(bucket: np.ndarray, row: np.ndarray, start: np.ndarray, end: np.ndarray, n: int) -> np.ndarray:
+    # Overlapping pairs per individual, from cells sorted by (dense bucket id, start)
+    well = end > start
+    starts = np.unique(start[well])
+    # Searchable keys: bucket id, then the rank of the start among all well-formed starts
+    width = len(starts) + 1
+    keys = bucket[well] * width + np.searchsorted(starts, start[well])
+
+    def starting_before(buckets: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        # Position in `keys` of the first well-formed meeting of each bucket starting at or after the end
+        return np.searchsorted(keys, buckets * width + np.searchsorted(starts, ends))
+
+    # A well-formed meeting overlaps exactly the later ones in its bucket that start before it ends,
+    # a contiguous run of the sorted keys
+    counts = starting_before(bucket[well], end[well]) - np.arange(len(keys)) - 1
+    overlaps = np.bincount(row[well], weights=counts, minlength=n).astype(np.int64)
+
+    # Meetings with end <= start never overlap each other; each is paired with the well-formed
+    # meetings of its bucket that start before its end, of which those ending after its start count
+    degenerate = np.flatnonzero(~well)
+    if len(degenerate):
+        first = np.searchsorted(keys, bucket[degenerate] * width)
+        lengths = starting_before(bucket[degenerate], end[degenerate]) - first
+        owner = np.repeat(degenerate, lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        candidate = np.repeat(first, lengths) + offsets
+        hit = end[well][candidate] > start[owner]
+        overlaps += np.bincount(row[owner][hit], minlength=n)
+    return overlaps
+
+
+class FitnessCache:
+    # LRU map from a 128-bit digest of (problem, genome) to its fitness score. The digest is keyed
+    # by the problem's fingerprint, so one cache can be shared across runs and problems.
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._scores = OrderedDict()
+
+    @staticmethod
+    def key(genome: np.ndarray, problem: 'SchedulingProblem') -> bytes:
+        return hashlib.blake2b(np.ascontiguousarray(genome).tobytes(), digest_size=16,
+                               key=problem.fingerprint).digest()
+
+    def get(self, key: bytes) -> Optional[float]:
+        score = self._scores.get(key)
+        if score is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._scores.move_to_end(key)
+        return score
+
+    def put(self, key: bytes, score: float):
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.max_size:
+            self._scores.popitem(last=False)
+
+    def __len__(self):
+        return len(self._scores)
+
+
+_WORKER_PROBLEM = None
+_WORKER_CACHE = None
+_WORKER_SEED = None
+
+
+def _init_worker(agents: List[Agent], meetings: List[Meeting], seed: Optional[np.ndarray] = None):
+    global _WORKER_PROBLEM, _WORKER_SEED
+    _WORKER_PROBLEM = SchedulingProblem(agents, meetings)
+    _WORKER_SEED = seed
+    if seed is not None:
+        _WORKER_PROBLEM.restrict_to_repair(seed)
+
+
+def _score_in_worker(matrix: np.ndarray, vectorized: bool) -> np.ndarray:
+    problem = _WORKER_PROBLEM
+    if vectorized:
+        return batch_fitness(matrix, problem)
+    return np.array([fitness(problem.decode(row), problem.agents, problem.skill_index) for row in matrix],
+                    dtype=np.float64)
+
+
+class ParallelEvaluator:
+    # Process pool that receives agents and meetings once, at start-up, and afterwards
+    # only uint16 genome matrices. Workers score with the same engine as the serial path.
+    def __init__(self, agents: List[Agent], meetings: List[Meeting], workers: int, vectorized: bool = False):
+        self.workers = workers
+        self.vectorized = vectorized
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                             initargs=(agents, meetings))
+
+    def evaluate(self, matrix: np.ndarray) -> np.ndarray:
+        chunks = np.array_split(matrix, min(self.workers, len(matrix)))
+        return np.concatenate(list(self._executor.map(_score_in_worker, chunks,
+                                                      itertools.repeat(self.vectorized))))
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def score_population(population: np.ndarray, problem: SchedulingProblem, cache: FitnessCache,
+                     vectorized: bool = False, evaluator: Optional[ParallelEvaluator] = None) -> np.ndarray:
+    matrix = np.atleast_2d(np.asarray(population))
+    scores = np.empty(len(matrix), dtype=np.float64)
+    pending = {}  # key -> rows of this batch that share it
+    for i, row in enumerate(matrix):
+        key = FitnessCache.key(row, problem)
+        if key in pending:
+            cache.hits += 1
+            pending[key].append(i)
+            continue
+        score = cache.get(key)
+        if score is None:
+            pending[key] = [i]
+        else:
+            scores[i] = score
+
+    if pending:
+        firsts = [rows[0] for rows in pending.values()]
+        if evaluator is not None:
+            computed = evaluator.evaluate(matrix[firsts])
+        elif vectorized:
+            computed = batch_fitness(matrix[firsts], problem)
+        else:
+            computed = [fitness(problem.decode(matrix[i]), problem.agents, problem.skill_index) for i in firsts]
+        for (key, rows), score in zip(pending.items(), computed):
+            scores[rows] = score
+            cache.put(key, float(score))
+    return scores
+
+
+def initialize_population(pop_size: int, agents: List[Agent], meetings: List[Meeting],
+                          skill_index: Optional[SkillIndex] = None) -> List[Dict[Meeting, Agent]]:
+    if skill_index is None:
+        skill_index = SkillIndex(agents)
     population = []
     for _ in range(pop_size):
         schedule = {}
         for meeting in meetings:
-            eligible_agents = [agent for agent in agents if
-                               meeting.required_skill in agent.skills or meeting.required_skill == 'Monitoring']
+            eligible_agents = skill_index.eligible(meeting.required_skill)
             if eligible_agents:
                 schedule[meeting] = random.choice(eligible_agents)
         population.append(schedule)
     return population
 
 
-def fitness(schedule: Dict[Meeting, Agent], agents: List[Agent]) -> float:
-    score = 0
+def fitness(schedule: Dict[Meeting, Agent], agents: List[Agent], skill_index: Optional[SkillIndex] = None) -> float:
+    penalty = 0  # in 1/360 points, see _UNITS_PER_POINT
     agent_schedules = {agent: {} for agent in agents}
 
     for meeting, agent in schedule.items():
-        if meeting.required_skill not in agent.skills and meeting.required_skill != 'Monitoring':
-            score -= 100
+        if skill_index is not None:
+            if not skill_index.is_eligible(meeting.required_skill, agent):
+                penalty += _SKILL_UNITS
+        elif meeting.required_skill not in agent.skills and meeting.required_skill != 'Monitoring':
+            penalty += _SKILL_UNITS
 
         date = meeting.start.date()
         if date not in agent_schedules[agent]:
             agent_schedules[agent][date] = []
         agent_schedules[agent][date].append(meeting)
 
-        # Check for overlapping meetings
-        for other_meeting in agent_schedules[agent][date]:
-            if meeting != other_meeting and (meeting.start < other_meeting.end and meeting.end > other_meeting.start):
-                score -= 50
-
-    for agent, dates in agent_schedules.items():
-        for date, meetings in dates.items():
-            work_hours = sum((meeting.end - meeting.start).seconds / 3600 for meeting in meetings)
-            if work_hours > 8:
-                score -= (work_hours - 8) * 10
-
-            # Check for proper breaks
-            sorted_meetings = sorted(meetings, key=lambda m: m.start)
-            for i in range(len(sorted_meetings) - 1):
-                break_time = (sorted_meetings[i + 1].start - sorted_meetings[i].end).seconds / 3600
-                if break_time < 0.5:  # Less than 30 minutes break
-                    score -= 25
-
-    return score
+    penalty += sum(_bucket_penalty(meetings) for dates in agent_schedules.values() for meetings in dates.values())
+    return -penalty / _UNITS_PER_POINT
 
 
 def crossover(parent1: Dict[Meeting, Agent], parent2: Dict[Meeting, Agent]) -> Tuple[
@@ -81,63 +395,1099 @@ def crossover(parent1: Dict[Meeting, Agent], parent2: Dict[Meeting, Agent]) -> T
     return child1, child2
 
 
-def mutate(schedule: Dict[Meeting, Agent], agents: List[Agent], mutation_rate: float):
+def mutate(schedule: Dict[Meeting, Agent], agents: List[Agent], mutation_rate: float,
+           skill_index: Optional[SkillIndex] = None):
+    if skill_index is None:
+        skill_index = SkillIndex(agents)
     for meeting in schedule:
         if random.random() < mutation_rate:
-            eligible_agents = [agent for agent in agents if
-                               meeting.required_skill in agent.skills or meeting.required_skill == 'Monitoring']
+            eligible_agents = skill_index.eligible(meeting.required_skill)
             if eligible_agents:
                 schedule[meeting] = random.choice(eligible_agents)
 
 
-def genetic_algorithm(agents: List[Agent], meetings: List[Meeting], pop_size: int, generations: int,
-                      mutation_rate: float) -> Dict[Meeting, Agent]:
-    population = initialize_population(pop_size, agents, meetings)
+def _greedy_genome(problem: SchedulingProblem, order: List[int], choose: Callable) -> np.ndarray:
+    # Assigns meetings in `order`, preferring agents that are free: no overlap, at least a
+    # 30 minute break after their previous meeting that day and no more than 8 hours of work.
+    # `choose(candidates, last_end, worked, day)` picks one agent index from the candidates.
+    genome = np.full(len(problem.meetings), UNASSIGNED, dtype=GENOME_DTYPE)
+    starts, ends = problem.starts.tolist(), problem.ends.tolist()
+    durations, days = problem.durations.tolist(), problem.days.tolist()
+    last_end = {}  # {(agent, day): latest end assigned so far}
+    worked = {}  # {(agent, day): seconds assigned so far}
+    for i in order:
+        day = days[i]
+        free = [a for a in problem.eligible[i]
+                if ((a, day) not in last_end or starts[i] - last_end[a, day] >= _MIN_BREAK_US)
+                and worked.get((a, day), 0) + durations[i] <= _MAX_WORK_SECONDS]
+        agent = choose(free or problem.eligible[i], last_end, worked, day)
+        genome[i] = agent
+        last_end[agent, day] = max(last_end.get((agent, day), ends[i]), ends[i])
+        worked[agent, day] = worked.get((agent, day), 0) + durations[i]
+    return genome
+
+
+def _least_loaded(candidates: List[int], last_end: dict, worked: dict, day: int) -> int:
+    return min(candidates, key=lambda a: worked.get((a, day), 0))
+
+
+def _tightest_fit(candidates: List[int], last_end: dict, worked: dict, day: int) -> int:
+    # Interval-scheduling best fit: the agent whose last meeting ended most recently
+    return max(candidates, key=lambda a: (last_end.get((a, day), -1), -worked.get((a, day), 0)))
+
+
+def _random_free(candidates: List[int], last_end: dict, worked: dict, day: int) -> int:
+    return random.choice(candidates)
+
+
+def greedy_genomes(count: int, problem: SchedulingProblem) -> List[np.ndarray]:
+    # Constructive seeds: earliest-end-first best fit, least-loaded in start order, then
+    # randomized greedy (random free agent, meetings in start order) for the rest
+    assigned = problem.assigned.tolist()
+    by_start = sorted(assigned, key=lambda i: (problem.starts[i], i))
+    by_end = sorted(assigned, key=lambda i: (problem.ends[i], problem.starts[i], i))
+    genomes = []
+    for n in range(count):
+        if n == 0:
+            genomes.append(_greedy_genome(problem, by_end, _tightest_fit))
+        elif n == 1:
+            genomes.append(_greedy_genome(problem, by_start, _least_loaded))
+        else:
+            genomes.append(_greedy_genome(problem, by_start, _random_free))
+    return genomes
+
+
+def initialize_genomes(pop_size: int, problem: SchedulingProblem, seed: Optional[np.ndarray] = None,
+                       greedy_fraction: float = 0.0) -> List[np.ndarray]:
+    # With a seed genome only its UNASSIGNED (new or changed) meetings are drawn at random.
+    # Otherwise `greedy_fraction` of the population is built by `greedy_genomes`.
+    population = []
+    if seed is None:
+        seed = np.full(len(problem.meetings), UNASSIGNED, dtype=GENOME_DTYPE)
+        population = greedy_genomes(min(pop_size, int(round(pop_size * greedy_fraction))), problem)
+    free = problem.assigned[seed[problem.assigned] == UNASSIGNED].tolist()
+    while len(population) < pop_size:
+        genome = seed.copy()
+        for i in free:
+            genome[i] = random.choice(problem.eligible[i])
+        population.append(genome)
+    return population
+
+
+def crossover_genomes(parent1: np.ndarray, parent2: np.ndarray, problem: SchedulingProblem) -> Tuple[
+    np.ndarray, np.ndarray]:
+    # Same cut as `crossover`: the point indexes assigned meetings, in meeting order
+    crossover_point = random.randint(0, len(problem.assigned))
+    cut = problem.assigned[crossover_point] if crossover_point < len(problem.assigned) else len(parent1)
+    child1 = np.concatenate((parent1[:cut], parent2[cut:]))
+    child2 = np.concatenate((parent2[:cut], parent1[cut:]))
+    return child1, child2
+
+
+def mutate_genome(genome: np.ndarray, problem: SchedulingProblem, mutation_rate: float):
+    changes = {}
+    _mutation_changes(problem, mutation_rate, changes)
+    if changes:
+        genome[list(changes)] = list(changes.values())
+
+
+CROSSOVER_METHODS = ('one_point', 'uniform', 'day_block')
+
+
+def crossover_population(parents1: np.ndarray, parents2: np.ndarray, problem: SchedulingProblem, method: str,
+                         rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    # Row k of the two parent matrices is one pair; all children come from a single mask that is
+    # True where child1 inherits from parents1 (and child2 from parents2)
+    pairs, length = parents1.shape
+    if method == 'one_point':
+        # Same cut positions as `crossover_genomes`
+        points = rng.integers(0, len(problem.assigned) + 1, size=pairs)
+        cuts = np.append(problem.assigned, length)[points]
+        mask = np.arange(length) < cuts[:, None]
+    elif method == 'uniform':
+        mask = rng.random((pairs, length)) < 0.5
+    elif method == 'day_block':
+        # Whole days move together, which keeps each agent's day intact
+        mask = (rng.random((pairs, max(1, problem.num_days))) < 0.5)[:, problem.days]
+    else:
+        raise ValueError(f"Unknown crossover method: {method}")
+    return np.where(mask, parents1, parents2), np.where(mask, parents2, parents1)
+
+
+def mutate_population(population: np.ndarray, problem: SchedulingProblem, mutation_rate: float,
+                      rng: np.random.Generator):
+    # In place: every mutable cell flips with probability `mutation_rate` to a uniformly drawn
+    # eligible agent, like `mutate_genome` row by row
+    mutable = problem.mutable
+    if len(mutable) == 0 or len(population) == 0:
+        return
+    flips = rng.random((len(population), len(mutable))) < mutation_rate
+    rows, cols = np.nonzero(flips)
+    meetings = mutable[cols]
+    choices = (rng.random(len(meetings)) * problem.eligible_counts[meetings]).astype(np.intp)
+    population[rows, meetings] = problem.eligible_table[meetings, choices]
+
+
+def _bucket_terms(meetings: List[Meeting]) -> Tuple[int, int, int]:
+    # Overlapping pairs, work seconds and short breaks of one agent's day, from a single sort
+    # and sweep
+    sorted_meetings = sorted(meetings, key=lambda m: m.start)
+
+    overlaps = 0
+    short_breaks = 0
+    active_ends = []  # min-heap of ends of the well-formed meetings swept so far
+    degenerate = []  # meetings with end <= start, which the sweep cannot order
+    for i, meeting in enumerate(sorted_meetings):
+        if i > 0:
+            break_time = (meeting.start - sorted_meetings[i - 1].end).seconds
+            if break_time < 1800:  # Less than 30 minutes break
+                short_breaks += 1
+        if meeting.end <= meeting.start:
+            degenerate.append(meeting)
+            continue
+        # Starts only grow, so meetings that ended before this one starts can be dropped for good
+        while active_ends and active_ends[0] <= meeting.start:
+            heapq.heappop(active_ends)
+        overlaps += len(active_ends)
+        heapq.heappush(active_ends, meeting.end)
+
+    if degenerate:
+        well_formed = [m for m in sorted_meetings if m.end > m.start]
+        for j, meeting in enumerate(degenerate):
+            for other_meeting in well_formed + degenerate[j + 1:]:
+                if meeting.start < other_meeting.end and meeting.end > other_meeting.start:
+                    overlaps += 1
+
+    work_seconds = sum((meeting.end - meeting.start).seconds for meeting in meetings)
+    return overlaps, work_seconds, short_breaks
+
+
+def _bucket_penalty(meetings: List[Meeting]) -> int:
+    # In 1/360 points, see _UNITS_PER_POINT
+    overlaps, work_seconds, short_breaks = _bucket_terms(meetings)
+    return _OVERLAP_UNITS * overlaps + _BREAK_UNITS * short_breaks + max(0, work_seconds - _MAX_WORK_SECONDS)
+
+
+class IncrementalFitness:
+    # One genome plus its fitness broken down into independent (agent index, day) buckets.
+    # `apply` rescores only the buckets that the changed meetings leave or join.
+    def __init__(self, problem: SchedulingProblem, genome: np.ndarray):
+        self.problem = problem
+        self.genome = np.array(genome, dtype=GENOME_DTYPE)
+        self.members = {}  # {(agent, day): [meeting indices in meeting order]}
+        self.skill_penalty = 0
+        days = problem.days.tolist()
+        for i, agent in enumerate(self.genome.tolist()):
+            if agent != UNASSIGNED:
+                self.members.setdefault((agent, days[i]), []).append(i)
+                if not problem.skill_ok[i, agent]:
+                    self.skill_penalty += _SKILL_UNITS
+        self.penalties = {key: self._penalty(members) for key, members in self.members.items()}
+        # Integer total in 1/360 points, so any sequence of `apply` calls gives the same score as
+        # scoring the final genome from scratch
+        self.penalty = self.skill_penalty + sum(self.penalties.values())
+
+    @property
+    def score(self) -> float:
+        return -self.penalty / _UNITS_PER_POINT
+
+    def _penalty(self, members: List[int]) -> int:
+        return _bucket_penalty([self.problem.meetings[i] for i in members])
+
+    def copy(self) -> 'IncrementalFitness':
+        # Bucket lists are shared with the copy and replaced, never mutated, by `apply`
+        clone = IncrementalFitness.__new__(IncrementalFitness)
+        clone.problem = self.problem
+        clone.genome = self.genome.copy()
+        clone.members = dict(self.members)
+        clone.penalties = dict(self.penalties)
+        clone.skill_penalty = self.skill_penalty
+        clone.penalty = self.penalty
+        return clone
+
+    def apply(self, changes: Dict[int, int]):
+        skill_ok = self.problem.skill_ok
+        touched = set()
+        old_skill_penalty = self.skill_penalty
+        for i, agent in changes.items():
+            old = int(self.genome[i])
+            if old == agent:
+                continue
+            day = int(self.problem.days[i])
+            if old != UNASSIGNED:
+                key = (old, day)
+                members = [j for j in self.members[key] if j != i]
+                if members:
+                    self.members[key] = members
+                else:
+                    del self.members[key]
+                touched.add(key)
+                if not skill_ok[i, old]:
+                    self.skill_penalty -= _SKILL_UNITS
+            if agent != UNASSIGNED:
+                key = (agent, day)
+                members = list(self.members.get(key, ()))
+                bisect.insort(members, i)
+                self.members[key] = members
+                touched.add(key)
+                if not skill_ok[i, agent]:
+                    self.skill_penalty += _SKILL_UNITS
+            self.genome[i] = agent
+
+        delta = self.skill_penalty - old_skill_penalty
+        for key in touched:
+            delta -= self.penalties.pop(key, 0)
+            if key in self.members:
+                self.penalties[key] = self._penalty(self.members[key])
+                delta += self.penalties[key]
+        self.penalty += delta
+
+    def move_gain(self, i: int, agent: int) -> float:
+        # Score change `apply({i: agent})` would make, without applying it
+        old = int(self.genome[i])
+        if old == agent:
+            return 0.0
+        skill_ok = self.problem.skill_ok
+        day = int(self.problem.days[i])
+        gain = 0
+        if old != UNASSIGNED:
+            key = (old, day)
+            members = [j for j in self.members[key] if j != i]
+            gain += self.penalties[key] - (self._penalty(members) if members else 0)
+            if not skill_ok[i, old]:
+                gain += _SKILL_UNITS
+        if agent != UNASSIGNED:
+            key = (agent, day)
+            members = list(self.members.get(key, ()))
+            bisect.insort(members, i)
+            gain -= self._penalty(members) - self.penalties.get(key, 0)
+            if not skill_ok[i, agent]:
+                gain -= _SKILL_UNITS
+        return gain / _UNITS_PER_POINT
 
+
+class IntervalIndex:
+    # Meetings of each (agent index, day) as (start, end, meeting) tuples sorted by start, plus the
+    # running maximum of their ends, so whether an agent is free around a meeting is a bisect
+    # instead of a scan of their day
+    def __init__(self, problem: SchedulingProblem, genome: np.ndarray):
+        self.problem = problem
+        self.intervals = {}  # {(agent, day): [(start, end, meeting index)]}
+        self.reach = {}  # {(agent, day): [latest end among the first k + 1 intervals]}
+        self.worked = {}  # {(agent, day): seconds}
+        for i, agent in enumerate(genome.tolist()):
+            if agent != UNASSIGNED:
+                self.add(i, agent)
+
+    def _entry(self, i: int) -> Tuple[int, int, int]:
+        return int(self.problem.starts[i]), int(self.problem.ends[i]), i
+
+    def _update_reach(self, key: Tuple[int, int]):
+        self.reach[key] = list(itertools.accumulate((end for _, end, _ in self.intervals[key]), max))
+
+    def add(self, i: int, agent: int):
+        key = (agent, int(self.problem.days[i]))
+        bisect.insort(self.intervals.setdefault(key, []), self._entry(i))
+        self._update_reach(key)
+        self.worked[key] = self.worked.get(key, 0) + int(self.problem.durations[i])
+
+    def remove(self, i: int, agent: int):
+        key = (agent, int(self.problem.days[i]))
+        self.intervals[key].remove(self._entry(i))
+        self._update_reach(key)
+        self.worked[key] -= int(self.problem.durations[i])
+
+    def is_free(self, agent: int, i: int) -> bool:
+        # No meeting within the 30 minute break on either side and room left in the 8 hour day.
+        # Only meetings starting before `end` plus the break can clash, and they all stay clear
+        # when the latest of their ends plus the break is no later than `start`.
+        start, end, _ = self._entry(i)
+        key = (agent, int(self.problem.days[i]))
+        if self.worked.get(key, 0) + int(self.problem.durations[i]) > _MAX_WORK_SECONDS:
+            return False
+        position = bisect.bisect_left(self.intervals.get(key, ()), (end + _MIN_BREAK_US,))
+        return position == 0 or self.reach[key][position - 1] + _MIN_BREAK_US <= start
+
+
+def local_search(individual: IncrementalFitness, max_moves: Optional[int] = None) -> int:
+    # Memetic repair, in place: meetings of penalized (agent, day) buckets move to the first
+    # eligible agent who is free around them, if that raises the score, or else to the eligible
+    # agent with the best improving move. Returns the moves made.
+    problem = individual.problem
+    index = IntervalIndex(problem, individual.genome)
+    movable = np.zeros(len(problem.meetings), dtype=bool)
+    movable[problem.mutable] = True
+    moves = 0
+    for key in [key for key, penalty in individual.penalties.items() if penalty > 0]:
+        for i in list(individual.members.get(key, ())):
+            if individual.penalties.get(key, 0) <= 0:
+                break
+            if not movable[i]:
+                continue
+            old = key[0]
+            others = [agent for agent in problem.eligible[i] if agent != old]
+            free = [agent for agent in others if index.is_free(agent, i)]
+            target = next((agent for agent in free if individual.move_gain(i, agent) > 0), None)
+            if target is None:
+                # Nobody is free on a dense day: take the move that lowers the penalty most
+                gains = [(individual.move_gain(i, agent), agent) for agent in others if agent not in free]
+                gain, agent = max(gains, default=(0.0, None))
+                target = agent if gain > 0 else None
+            if target is not None:
+                individual.apply({i: target})
+                index.remove(i, old)
+                index.add(i, target)
+                moves += 1
+            if max_moves is not None and moves >= max_moves:
+                return moves
+    return moves
+
+
+def repair_population(population: list, problem: SchedulingProblem, elites: int, repair_elites: bool,
+                      repair_rate: float, delta: bool = False, repaired: Optional[set] = None) -> set:
+    # Runs `local_search` on the first `elites` individuals (if `repair_elites`) and on each
+    # other one with probability `repair_rate`. Individuals are copied first, since the previous
+    # generation and the best-so-far record may still hold them. `repaired` holds the genome
+    # bytes already searched, so surviving elites are not searched again; the returned set is
+    # the one to pass for the next generation.
+    repaired = repaired or set()
+    searched = set()
+    for k, individual in enumerate(population):
+        if k < elites:
+            if not repair_elites:
+                continue
+        elif not (repair_rate > 0 and random.random() < repair_rate):
+            continue
+        key = (individual.genome if delta else individual).tobytes()
+        if key not in repaired:
+            candidate = individual.copy() if delta else IncrementalFitness(problem, individual)
+            if local_search(candidate):
+                population[k] = candidate if delta else candidate.genome
+                key = candidate.genome.tobytes()
+        searched.add(key)
+    return searched
+
+
+def _crossover_changes(parent1: IncrementalFitness, parent2: IncrementalFitness) -> Tuple[
+    Dict[int, int], Dict[int, int]]:
+    # Same cut as `crossover_genomes`
+    assigned = parent1.problem.assigned
+    crossover_point = random.randint(0, len(assigned))
+    tail = assigned[crossover_point:]
+    differing = tail[parent1.genome[tail] != parent2.genome[tail]]
+    changes1 = dict(zip(differing.tolist(), parent2.genome[differing].tolist()))
+    changes2 = dict(zip(differing.tolist(), parent1.genome[differing].tolist()))
+    return changes1, changes2
+
+
+def _mutation_changes(problem: SchedulingProblem, mutation_rate: float, changes: Dict[int, int]):
+    for i in problem.mutable.tolist():
+        if random.random() < mutation_rate:
+            changes[i] = random.choice(problem.eligible[i])
+
+
+def breed_incremental(parent1: IncrementalFitness, parent2: IncrementalFitness, mutation_rate: float) -> Tuple[
+    IncrementalFitness, IncrementalFitness]:
+    changes1, changes2 = _crossover_changes(parent1, parent2)
+    _mutation_changes(parent1.problem, mutation_rate, changes1)
+    _mutation_changes(parent2.problem, mutation_rate, changes2)
+
+    child1, child2 = parent1.copy(), parent2.copy()
+    child1.apply(changes1)
+    child2.apply(changes2)
+    return child1, child2
+
+
+class SearchProgress:
+    # Best schedule found so far plus the anytime stopping rules. The GA updates it once per
+    # generation; other threads may read `best_fitness` or call `best_schedule()` at any time.
+    def __init__(self, problem: SchedulingProblem, time_limit: Optional[float] = None,
+                 stall_generations: Optional[int] = None, target_fitness: Optional[float] = None,
+                 callback: Optional[Callable[['SearchProgress'], Optional[bool]]] = None):
+        self.problem = problem
+        self.time_limit = time_limit
+        self.stall_generations = stall_generations
+        self.target_fitness = target_fitness
+        self.callback = callback
+        self.started = time.perf_counter()
+        self.generation = 0
+        self.stalled = 0
+        self.stop_reason = None
+        self._best = (float('-inf'), None)  # (fitness, genome), swapped in one assignment
+
+    @property
+    def best_fitness(self) -> float:
+        return self._best[0]
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def best_schedule(self) -> Dict[Meeting, Agent]:
+        genome = self._best[1]
+        return {} if genome is None else self.problem.decode(genome)
+
+    def record(self, generation: int, best_fitness: float, best_genome: np.ndarray) -> bool:
+        # Returns True when the search should stop. `stalled` counts generations, also when the
+        # island model only records once per migration epoch.
+        self.stalled = 0 if best_fitness > self._best[0] else self.stalled + generation - self.generation
+        if best_fitness >= self._best[0]:
+            self._best = (best_fitness, best_genome)
+        self.generation = generation
+
+        if self.target_fitness is not None and best_fitness >= self.target_fitness:
+            self.stop_reason = 'target'
+        elif self.stall_generations is not None and self.stalled >= self.stall_generations:
+            self.stop_reason = 'stalled'
+        elif self.time_limit is not None and self.elapsed >= self.time_limit:
+            self.stop_reason = 'time_limit'
+        elif self.callback is not None and self.callback(self):
+            self.stop_reason = 'callback'
+        return self.stop_reason is not None
+
+
+class Logbook:
+    # Per-generation statistics; `select` follows the DEAP logbook interface the Analytics page uses
+    FIELDS = ['gen', 'min', 'max', 'avg', 'diversity', 'evaluations', 'cache_hits',
+              'time_evaluate', 'time_select', 'time_crossover', 'time_mutate', 'time_repair']
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, **fields):
+        self.records.append(fields)
+
+    def select(self, *names):
+        columns = tuple([record.get(name) for record in self.records] for name in names)
+        return columns[0] if len(columns) == 1 else columns
+
+    def __len__(self):
+        return len(self.records)
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        text = json.dumps(self.records, indent=2)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+    def to_csv(self, path: Optional[str] = None) -> str:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(self.records)
+        if path is not None:
+            with open(path, 'w', newline='') as f:
+                f.write(buffer.getvalue())
+        return buffer.getvalue()
+
+
+def _diversity(genomes: List[np.ndarray], best: int) -> float:
+    # Mean share of meetings on which an individual disagrees with the generation's best
+    matrix = np.stack(genomes)
+    return float((matrix != matrix[best]).mean()) if matrix.size else 0.0
+
+
+def top_indices(scores: np.ndarray, count: int, method: str = 'argpartition') -> List[int]:
+    # Indices of the `count` highest scores, best first, ties broken by position: the same as
+    # np.argsort(-scores, kind='stable')[:count] without sorting the whole population
+    count = min(count, len(scores))
+    if count <= 0:
+        return []
+    if method == 'heap':
+        return heapq.nlargest(count, range(len(scores)), key=scores.__getitem__)
+    if method != 'argpartition':
+        raise ValueError(f"Unknown truncation method: {method}")
+    threshold = scores[np.argpartition(-scores, count - 1)[count - 1]]
+    above = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[:count - len(above)]
+    chosen = np.concatenate((above, tied))
+    return chosen[np.argsort(-scores[chosen], kind='stable')].tolist()
+
+
+class TruncationSelection:
+    # Parents are drawn uniformly from the best `fraction` of the population
+    def __init__(self, elites: int = 2, fraction: float = 0.5, method: str = 'argpartition'):
+        self.elites = elites
+        self.fraction = fraction
+        self.method = method
+
+    def __repr__(self):
+        return f"TruncationSelection(elites={self.elites}, fraction={self.fraction}, method={self.method!r})"
+
+    def survivors(self, scores: np.ndarray) -> List[int]:
+        return top_indices(scores, self.elites, self.method)
+
+    def pairs(self, scores: np.ndarray, pop_size: int) -> Iterator[Tuple[int, int]]:
+        # Lazy, so parent draws interleave with crossover and mutation in the random stream
+        pool = top_indices(scores, max(2, int(pop_size * self.fraction)), self.method)
+        while True:
+            yield tuple(random.sample(pool, 2))
+
+
+class TournamentSelection:
+    # Each parent is the best of `size` individuals drawn with replacement
+    def __init__(self, elites: int = 2, size: int = 3):
+        self.elites = elites
+        self.size = size
+
+    def __repr__(self):
+        return f"TournamentSelection(elites={self.elites}, size={self.size})"
+
+    def survivors(self, scores: np.ndarray) -> List[int]:
+        return top_indices(scores, self.elites)
+
+    def pairs(self, scores: np.ndarray, pop_size: int) -> Iterator[Tuple[int, int]]:
+        contestants = range(len(scores))
+        while True:
+            yield (max(random.choices(contestants, k=self.size), key=scores.__getitem__),
+                   max(random.choices(contestants, k=self.size), key=scores.__getitem__))
+
+
+Selection = Union[TruncationSelection, TournamentSelection]
+
+
+def _next_generation(population: list, scores: np.ndarray, problem: SchedulingProblem, pop_size: int,
+                     mutation_rate: float, delta: bool = False, timings: Optional[Dict[str, float]] = None,
+                     selection: Optional[Selection] = None, crossover_method: Optional[str] = None) -> list:
+    # `timings`, when given, accumulates seconds spent per phase; in delta mode the incremental
+    # rescoring done while breeding is booked under crossover. With a `crossover_method` the
+    # children are bred as one matrix by `crossover_population` and `mutate_population`.
+    clock = time.perf_counter if timings is not None else None
+    if clock:
+        started = clock()
+    if selection is None:
+        selection = TruncationSelection()
+    new_population = [population[i] for i in selection.survivors(scores)]
+    pairs = selection.pairs(scores, pop_size)
+
+    if crossover_method is not None:
+        return _next_generation_batched(population, new_population, pairs, problem, pop_size, mutation_rate,
+                                        crossover_method, timings, started if clock else None)
+
+    while len(new_population) < pop_size:
+        first, second = next(pairs)
+        parent1, parent2 = population[first], population[second]
+        if clock:
+            selected = clock()
+            timings['select'] += selected - started
+        if delta:
+            child1, child2 = breed_incremental(parent1, parent2, mutation_rate)
+            if clock:
+                started = clock()
+                timings['crossover'] += started - selected
+        else:
+            child1, child2 = crossover_genomes(parent1, parent2, problem)
+            if clock:
+                crossed = clock()
+                timings['crossover'] += crossed - selected
+            mutate_genome(child1, problem, mutation_rate)
+            mutate_genome(child2, problem, mutation_rate)
+            if clock:
+                started = clock()
+                timings['mutate'] += started - crossed
+        new_population.extend([child1, child2])
+
+    return new_population
+
+
+def _next_generation_batched(population: list, survivors: list, pairs: Iterator[Tuple[int, int]],
+                             problem: SchedulingProblem, pop_size: int, mutation_rate: float, crossover_method: str,
+                             timings: Optional[Dict[str, float]], started: Optional[float]) -> list:
+    clock = time.perf_counter if timings is not None else None
+    # Pairs are drawn before the array generator, so the random stream stays deterministic per seed
+    count = max(0, -(-(pop_size - len(survivors)) // 2))
+    drawn = np.array([next(pairs) for _ in range(count)], dtype=np.intp).reshape(count, 2)
+    rng = np.random.default_rng(random.getrandbits(64))
+    matrix = np.stack(population)
+    if clock:
+        selected = clock()
+        timings['select'] += selected - started
+    children1, children2 = crossover_population(matrix[drawn[:, 0]], matrix[drawn[:, 1]], problem,
+                                                crossover_method, rng)
+    # Interleaved like the per-pair loop: child1 and child2 of each pair are neighbours
+    children = np.empty((2 * count, matrix.shape[1]), dtype=matrix.dtype)
+    children[0::2], children[1::2] = children1, children2
+    if clock:
+        crossed = clock()
+        timings['crossover'] += crossed - selected
+    mutate_population(children, problem, mutation_rate, rng)
+    if clock:
+        timings['mutate'] += clock() - crossed
+    return survivors + list(children)
+
+
+def genetic_algorithm(agents: List[Agent], meetings: List[Meeting], pop_size: int, generations: Optional[int],
+                      mutation_rate: float, vectorized: bool = False,
+                      cache: Optional[FitnessCache] = None, delta: bool = False,
+                      skill_index: Optional[SkillIndex] = None, workers: Optional[int] = None,
+                      islands: int = 1, migration_interval: int = 10, migrants: int = 2,
+                      topology: str = 'ring', time_limit: Optional[float] = None,
+                      stall_generations: Optional[int] = None, target_fitness: Optional[float] = None,
+                      callback: Optional[Callable[[SearchProgress], Optional[bool]]] = None,
+                      initial_schedule: Optional[Dict[Meeting, Agent]] = None,
+                      logbook: Optional[Logbook] = None, greedy_fraction: float = 0.0,
+                      selection: Optional[Selection] = None,
+                      crossover_method: Optional[str] = None, repair_rate: float = 0.0,
+                      repair_elites: bool = False) -> Dict[Meeting, Agent]:
+    if generations is None and time_limit is None and stall_generations is None and callback is None:
+        raise ValueError("Without a generation count, give a time_limit, stall_generations or callback to stop on")
+    if crossover_method is not None:
+        if crossover_method not in CROSSOVER_METHODS:
+            raise ValueError(f"Unknown crossover method: {crossover_method}")
+        if delta:
+            raise ValueError("Batched crossover breeds genome matrices and cannot be combined with delta scoring")
+
+    problem = SchedulingProblem(agents, meetings, skill_index)
+    progress = SearchProgress(problem, time_limit, stall_generations, target_fitness, callback)
+    if selection is None:
+        selection = TruncationSelection()
+    seed = None
+    if initial_schedule is not None:
+        seed = problem.encode(initial_schedule)
+        problem.restrict_to_repair(seed)
+    if islands > 1:
+        return _island_genetic_algorithm(agents, meetings, pop_size, generations, mutation_rate, islands,
+                                         migration_interval, migrants, topology, workers, progress, seed, logbook,
+                                         greedy_fraction, selection, crossover_method, repair_rate, repair_elites)
+
+    population = initialize_genomes(pop_size, problem, seed, greedy_fraction)
+    if cache is None:
+        cache = FitnessCache()
+    if delta:
+        # Individuals carry their own bucket breakdown and are rescored incrementally
+        population = [IncrementalFitness(problem, genome) for genome in population]
+    # Incremental scores are already carried by the individuals, so there is nothing to farm out
+    evaluator = (ParallelEvaluator(agents, meetings, workers, vectorized)
+                 if workers and workers > 1 and not delta else None)
+
+    # Phase timings of the breeding step that produced the current generation
+    timings = dict(select=0.0, crossover=0.0, mutate=0.0, repair=0.0) if logbook is not None else None
+    new_individuals = len(population)
+    repaired = set()
+
+    try:
+        for generation in itertools.count() if generations is None else range(generations + 1):
+            if logbook is not None:
+                started, hits, misses = time.perf_counter(), cache.hits, cache.misses
+            if delta:
+                scores = np.array([individual.score for individual in population], dtype=np.float64)
+            else:
+                scores = score_population(population, problem, cache, vectorized, evaluator)
+            best = int(np.argmax(scores))
+            best_genome = population[best].genome if delta else population[best]
+
+            if logbook is not None:
+                genomes = [individual.genome for individual in population] if delta else population
+                logbook.record(gen=generation, min=float(scores.min()), max=float(scores.max()),
+                               avg=float(scores.mean()), diversity=_diversity(genomes, best),
+                               evaluations=new_individuals if delta else cache.misses - misses,
+                               cache_hits=cache.hits - hits, time_evaluate=time.perf_counter() - started,
+                               time_select=timings['select'], time_crossover=timings['crossover'],
+                               time_mutate=timings['mutate'], time_repair=timings['repair'])
+                timings = dict(select=0.0, crossover=0.0, mutate=0.0, repair=0.0)
+
+            if progress.record(generation, float(scores[best]), best_genome) or generation == generations:
+                break
+            population = _next_generation(population, scores, problem, pop_size, mutation_rate, delta, timings,
+                                          selection, crossover_method)
+            elites = min(selection.elites, len(scores))
+            if repair_elites or repair_rate > 0:
+                if logbook is not None:
+                    started = time.perf_counter()
+                repaired = repair_population(population, problem, elites, repair_elites, repair_rate, delta,
+                                             repaired)
+                if logbook is not None:
+                    timings['repair'] += time.perf_counter() - started
+            new_individuals = len(population) - elites
+
+        return progress.best_schedule()
+    finally:
+        if evaluator is not None:
+            evaluator.close()
+
+
+def _evolve_island(population: Optional[np.ndarray], rng_state: tuple, generations: int, pop_size: int,
+                   mutation_rate: float, greedy_fraction: float = 0.0,
+                   selection: Optional[Selection] = None,
+                   crossover_method: Optional[str] = None, repair_rate: float = 0.0,
+                   repair_elites: bool = False) -> Tuple[np.ndarray, np.ndarray, tuple]:
+    # Runs in a pool worker. The island's RNG state travels with it, so the outcome does not
+    # depend on which worker picks the island up.
+    global _WORKER_CACHE
+    if _WORKER_CACHE is None:
+        _WORKER_CACHE = FitnessCache()
+    problem = _WORKER_PROBLEM
+    random.setstate(rng_state)
+    repaired = set()
+    if population is None:
+        population = initialize_genomes(pop_size, problem, _WORKER_SEED, greedy_fraction)
+    else:
+        population = list(population)
     for _ in range(generations):
-        population = sorted(population, key=lambda x: fitness(x, agents), reverse=True)
-        new_population = population[:2]  # Keep the two best schedules
+        scores = score_population(population, problem, _WORKER_CACHE, vectorized=True)
+        population = _next_generation(population, scores, problem, pop_size, mutation_rate, selection=selection,
+                                      crossover_method=crossover_method)
+        if repair_elites or repair_rate > 0:
+            elites = min(selection.elites if selection is not None else 2, len(scores))
+            repaired = repair_population(population, problem, elites, repair_elites, repair_rate, repaired=repaired)
+    scores = score_population(population, problem, _WORKER_CACHE, vectorized=True)
+    return np.stack(population), scores, random.getstate()
+
+
+def _migrate(populations: List[np.ndarray], scores: List[np.ndarray], migrants: int, topology: str):
+    # Each island's best `migrants` genomes replace the worst ones of its destination island
+    count = len(populations)
+    if topology == 'ring':
+        destinations = [(i + 1) % count for i in range(count)]
+    elif topology == 'random':
+        destinations = [random.choice([j for j in range(count) if j != i]) for i in range(count)]
+    else:
+        raise ValueError(f"Unknown migration topology: {topology}")
+
+    outgoing = []
+    for population, island_scores in zip(populations, scores):
+        best = top_indices(island_scores, migrants)
+        outgoing.append((population[best].copy(), island_scores[best].copy()))
+    for source, destination in enumerate(destinations):
+        genomes, genome_scores = outgoing[source]
+        worst = top_indices(-scores[destination], len(genomes))
+        populations[destination][worst] = genomes
+        scores[destination][worst] = genome_scores
+
+
+def _island_genetic_algorithm(agents: List[Agent], meetings: List[Meeting], pop_size: int,
+                              generations: Optional[int], mutation_rate: float, islands: int, migration_interval: int,
+                              migrants: int, topology: str, workers: Optional[int], progress: SearchProgress,
+                              seed: Optional[np.ndarray] = None, logbook: Optional[Logbook] = None,
+                              greedy_fraction: float = 0.0,
+                              selection: Optional[Selection] = None,
+                              crossover_method: Optional[str] = None, repair_rate: float = 0.0,
+                              repair_elites: bool = False) -> Dict[Meeting, Agent]:
+    # Stopping rules, callbacks and the logbook only see the islands between migration epochs
+    populations = [None] * islands
+    scores = [None] * islands
+    rng_states = [random.Random(random.getrandbits(64)).getstate() for _ in range(islands)]
+    migrants = min(migrants, pop_size)
+
+    with ProcessPoolExecutor(max_workers=workers or islands, initializer=_init_worker,
+                             initargs=(agents, meetings, seed)) as executor:
+        done = 0
+        while True:
+            epoch = migration_interval if generations is None else min(migration_interval, generations - done)
+            results = list(executor.map(_evolve_island, populations, rng_states, [epoch] * islands,
+                                        [pop_size] * islands, [mutation_rate] * islands,
+                                        [greedy_fraction] * islands, [selection] * islands,
+                                        [crossover_method] * islands, [repair_rate] * islands,
+                                        [repair_elites] * islands))
+            populations = [population for population, _, _ in results]
+            scores = [island_scores for _, island_scores, _ in results]
+            rng_states = [state for _, _, state in results]
+            done += epoch
+
+            island, row = max(((i, int(np.argmax(island_scores))) for i, island_scores in enumerate(scores)),
+                              key=lambda pick: scores[pick[0]][pick[1]])
+            if logbook is not None:
+                all_scores = np.concatenate(scores)
+                logbook.record(gen=done, min=float(all_scores.min()), max=float(all_scores.max()),
+                               avg=float(all_scores.mean()),
+                               diversity=_diversity(list(np.concatenate(populations)),
+                                                    sum(len(p) for p in populations[:island]) + row))
+            if progress.record(done, float(scores[island][row]), populations[island][row].copy()) or \
+                    done == generations:
+                break
+            _migrate(populations, scores, migrants, topology)
 
-        while len(new_population) < pop_size:
-            parent1, parent2 = random.sample(population[:pop_size // 2], 2)
-            child1, child2 = crossover(parent1, parent2)
-            mutate(child1, agents, mutation_rate)
-            mutate(child2, agents, mutation_rate)
-            new_population.extend([child1, child2])
+    return progress.best_schedule()
 
-        population = new_population
 
-    return max(population, key=lambda x: fitness(x, agents))
+def _solve_day(agents: List[Agent], meetings: List[Meeting], seed: int, options: Dict,
+               deadline: Optional[float] = None) -> np.ndarray:
+    # Runs in a pool worker; the genome comes back instead of the dict so the parent can map it
+    # onto its own Agent and Meeting objects. A date that waited in the queue only gets the time
+    # left before the shared `deadline` (a time.time() value, comparable across processes).
+    random.seed(seed)
+    if deadline is not None:
+        options = dict(options, time_limit=max(0.0, deadline - time.time()))
+    schedule = genetic_algorithm(agents, meetings, **options)
+    return SchedulingProblem(agents, meetings).encode(schedule)
 
 
-def assign_night_shifts(agents: List[Agent], meetings: List[Meeting]) -> Dict[Meeting, Agent]:
-    night_meetings = [m for m in meetings if m.is_night]
-    night_agents = [a for a in agents if "Security" in a.skills]
+def solve_by_day(agents: List[Agent], meetings: List[Meeting], workers: Optional[int] = None,
+                 initial_schedule: Optional[Dict[Meeting, Agent]] = None, **options) -> Dict[Meeting, Agent]:
+    # Every fitness term is scoped to one agent and one start date, so each date is an independent
+    # sub-problem. Dates are solved as separate GAs across processes and merged. A `time_limit`
+    # bounds the whole call, not each date.
+    time_limit = options.pop('time_limit', None)
+    deadline = time.time() + time_limit if time_limit is not None else None
+    by_date = {}
+    for meeting in meetings:
+        by_date.setdefault(meeting.start.date(), []).append(meeting)
+    dates = sorted(by_date)
+    seeds = [random.getrandbits(64) for _ in dates]
+
+    schedule = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for date, seed in zip(dates, seeds):
+            day_options = dict(options)
+            if initial_schedule is not None:
+                day_options['initial_schedule'] = {m: initial_schedule[m] for m in by_date[date]
+                                                   if m in initial_schedule}
+            futures.append(executor.submit(_solve_day, agents, by_date[date], seed, day_options, deadline))
+        for date, future in zip(dates, futures):
+            day_meetings = by_date[date]
+            for i, agent in enumerate(future.result().tolist()):
+                if agent != UNASSIGNED:
+                    schedule[day_meetings[i]] = agents[agent]
+    return schedule
+
+
+def carry_over_assignments(agents: List[Agent], meetings: List[Meeting],
+                           previous_schedule: Dict[Meeting, Agent]) -> Dict[Meeting, Agent]:
+    # Match meetings by (start, end, skill, night flag) and agents by id; assignments whose
+    # agent is gone or no longer eligible are dropped
+    skill_index = SkillIndex(agents)
+    agents_by_id = {agent.id: agent for agent in agents}
+    previous = {}
+    for meeting, agent in previous_schedule.items():
+        if agent is not None:
+            key = (meeting.start, meeting.end, meeting.required_skill, meeting.is_night)
+            previous.setdefault(key, []).append(agent.id)
+
+    carried = {}
+    for meeting in meetings:
+        agent_ids = previous.get((meeting.start, meeting.end, meeting.required_skill, meeting.is_night))
+        if agent_ids:
+            agent = agents_by_id.get(agent_ids.pop(0))
+            if agent is not None and skill_index.is_eligible(meeting.required_skill, agent):
+                carried[meeting] = agent
+    return carried
+
+
+def assign_night_shifts(agents: List[Agent], meetings: List[Meeting], skill_index: Optional[SkillIndex] = None,
+                        fixed: Optional[Dict[Meeting, Agent]] = None,
+                        night_counts: Optional[Dict[int, int]] = None,
+                        busy_dates: Optional[Dict[int, Iterable[datetime.date]]] = None) -> Tuple[
+        Dict[Meeting, Agent], List[Meeting]]:
+    # Each Security agent takes at most one night meeting per date, and a date already present in
+    # `Agent.schedule` or in `busy_dates` ({agent id: dates}) counts as taken. Meetings go to the
+    # free agent with the fewest nights so far (ties broken at random), counting `night_counts`
+    # ({agent id: nights}) from earlier periods. The agents are not modified. Returns the schedule
+    # and the night meetings nobody was free for.
+    if skill_index is None:
+        skill_index = SkillIndex(agents)
+    night_agents = skill_index.eligible("Security")
+    busy = {}  # {date: {agent}}
+    for agent in night_agents:
+        for date in itertools.chain(agent.schedule, (busy_dates or {}).get(agent.id, ())):
+            busy.setdefault(date, set()).add(agent)
+    loads = {agent: (night_counts or {}).get(agent.id, 0) for agent in night_agents}
 
     night_schedule = {}
-    for meeting in night_meetings:
-        available_agents = [a for a in night_agents if meeting.start.date() not in a.schedule]
-        if available_agents:
-            assigned_agent = random.choice(available_agents)
-            night_schedule[meeting] = assigned_agent
-            if meeting.start.date() not in assigned_agent.schedule:
-                assigned_agent.schedule[meeting.start.date()] = []
-            assigned_agent.schedule[meeting.start.date()].append(meeting)
+    # Keep carried-over assignments when the agent is still free that night
+    for meeting, agent in (fixed or {}).items():
+        date = meeting.start.date()
+        if meeting.is_night and agent in loads and agent not in busy.get(date, ()):
+            night_schedule[meeting] = agent
+            busy.setdefault(date, set()).add(agent)
+            loads[agent] += 1
+
+    by_date = {}
+    for meeting in meetings:
+        if meeting.is_night and meeting not in night_schedule:
+            by_date.setdefault(meeting.start.date(), []).append(meeting)
+
+    # Min-heap of (nights assigned, random tie-break, position, agent)
+    heap = [(loads[agent], random.random(), i, agent) for i, agent in enumerate(night_agents)]
+    heapq.heapify(heap)
+    unassigned = []
+    for date, date_meetings in by_date.items():
+        taken = busy.get(date, ())
+        set_aside = []  # popped agents that cannot work this date; restored afterwards
+        for meeting in date_meetings:
+            while heap and heap[0][3] in taken:
+                set_aside.append(heapq.heappop(heap))
+            if not heap:
+                unassigned.append(meeting)
+                continue
+            load, _, i, agent = heapq.heappop(heap)
+            night_schedule[meeting] = agent
+            # Held back until the date is done, which keeps the agent to one night meeting per date
+            set_aside.append((load + 1, random.random(), i, agent))
+        for entry in set_aside:
+            heapq.heappush(heap, entry)
+
+    return night_schedule, unassigned
+
+
+def run_scheduling_algorithm(agents: List[Agent], meetings: List[Meeting], pop_size: int = 50,
+                             generations: Optional[int] = 100, mutation_rate: float = 0.1,
+                             workers: Optional[int] = None, time_limit: Optional[float] = None,
+                             stall_generations: Optional[int] = None, target_fitness: Optional[float] = 0.0,
+                             callback: Optional[Callable[[SearchProgress], Optional[bool]]] = None,
+                             previous_schedule: Optional[Dict[Meeting, Agent]] = None,
+                             warm_generations: Optional[int] = None,
+                             logbook: Optional[Logbook] = None, seed: Optional[int] = None,
+                             result_cache: Optional['ResultCache'] = None,
+                             decompose: bool = False, greedy_fraction: float = 0.1,
+                             selection: Optional[Selection] = None,
+                             crossover_method: Optional[str] = 'one_point', repair_rate: float = 0.0,
+                             repair_elites: bool = True,
+                             night_counts: Optional[Dict[int, int]] = None,
+                             busy_dates: Optional[Dict[int, Iterable[datetime.date]]] = None) -> Dict[Meeting, Agent]:
+    if decompose and (callback is not None or logbook is not None):
+        raise ValueError("Per-day decomposition runs in worker processes and supports neither callback nor logbook")
+
+    # Identical problems are answered from the on-disk cache. Warm starts depend on the previous
+    # schedule, which is not part of the key, so they always solve.
+    cache_key, cancelled = None, []
+    if result_cache is not None and previous_schedule is None:
+        cache_key = result_cache.fingerprint(agents, meetings, dict(
+            pop_size=pop_size, generations=generations, mutation_rate=mutation_rate, time_limit=time_limit,
+            stall_generations=stall_generations, target_fitness=target_fitness, seed=seed, decompose=decompose,
+            greedy_fraction=greedy_fraction, selection=selection, crossover_method=crossover_method,
+            repair_rate=repair_rate, repair_elites=repair_elites, night_counts=night_counts,
+            busy_dates={agent_id: sorted(dates) for agent_id, dates in (busy_dates or {}).items()}))
+        cached = result_cache.get(cache_key, agents, meetings)
+        if cached is not None:
+            return cached
 
-    return night_schedule
+        # Runs stopped by the callback (e.g. cancelled from the UI) are not stored
+        user_callback = callback
+        if user_callback is not None:
+            def callback(progress: SearchProgress) -> Optional[bool]:
+                stop = user_callback(progress)
+                if stop:
+                    cancelled.append(progress.generation)
+                return stop
 
+    if seed is not None:
+        random.seed(seed)
+    skill_index = SkillIndex(agents)
+
+    # Warm start: keep the previous assignments of unchanged meetings and run a short repair
+    # search over the days that gained new or changed meetings
+    carried = None
+    if previous_schedule is not None:
+        carried = carry_over_assignments(agents, meetings, previous_schedule)
+        if warm_generations is None and generations is not None:
+            warm_generations = max(1, generations // 5)
+        generations = warm_generations
 
-def run_scheduling_algorithm(agents: List[Agent], meetings: List[Meeting]) -> Dict[Meeting, Agent]:
     # First, assign night shifts
-    night_schedule = assign_night_shifts(agents, meetings)
+    night_schedule, _ = assign_night_shifts(agents, meetings, skill_index, carried, night_counts, busy_dates)
 
     # Remove night meetings and update agent availability
     day_meetings = [m for m in meetings if not m.is_night]
 
     # Run genetic algorithm for day meetings
-    day_schedule = genetic_algorithm(agents, day_meetings, pop_size=50, generations=100, mutation_rate=0.1)
+    if decompose:
+        day_schedule = solve_by_day(agents, day_meetings, workers=workers, initial_schedule=carried,
+                                    pop_size=pop_size, generations=generations, mutation_rate=mutation_rate,
+                                    vectorized=True, time_limit=time_limit, stall_generations=stall_generations,
+                                    target_fitness=target_fitness, greedy_fraction=greedy_fraction,
+                                    selection=selection, crossover_method=crossover_method,
+                                    repair_rate=repair_rate, repair_elites=repair_elites)
+    else:
+        day_schedule = genetic_algorithm(agents, day_meetings, pop_size=pop_size, generations=generations,
+                                         mutation_rate=mutation_rate, vectorized=True, skill_index=skill_index,
+                                         workers=workers, time_limit=time_limit,
+                                         stall_generations=stall_generations, target_fitness=target_fitness,
+                                         callback=callback, initial_schedule=carried, logbook=logbook,
+                                         greedy_fraction=greedy_fraction, selection=selection,
+                                         crossover_method=crossover_method, repair_rate=repair_rate,
+                                         repair_elites=repair_elites)
 
     # Combine night and day schedules
     final_schedule = {**night_schedule, **day_schedule}
 
-    return final_schedule
\ No newline at end of file
+    if cache_key is not None and not cancelled:
+        result_cache.put(cache_key, meetings, final_schedule)
+    return final_schedule
+
+
+def _actual_end(meeting: Meeting) -> datetime.datetime:
+    # Night meetings that cross midnight keep the start date, so their end can precede the start
+    return meeting.start + (meeting.end - meeting.start) % datetime.timedelta(days=1)
+
+
+class HorizonState:
+    # Boundary state carried from one rolling-horizon window to the next, keyed by agent id:
+    # cumulative night meetings and the latest committed meeting (the agent's last shift). A last
+    # shift that runs past midnight into the next window keeps the agent off night duty that date.
+    def __init__(self, night_counts: Optional[Dict[int, int]] = None,
+                 last_shifts: Optional[Dict[int, Meeting]] = None):
+        self.night_counts = dict(night_counts or {})
+        self.last_shifts = dict(last_shifts or {})
+
+    def commit(self, schedule: Dict[Meeting, Agent]):
+        for meeting, agent in schedule.items():
+            if meeting.is_night:
+                self.night_counts[agent.id] = self.night_counts.get(agent.id, 0) + 1
+            last = self.last_shifts.get(agent.id)
+            if last is None or _actual_end(meeting) > _actual_end(last):
+                self.last_shifts[agent.id] = meeting
+
+    def busy_dates(self, first_date: datetime.date) -> Dict[int, List[datetime.date]]:
+        # Dates from `first_date` on that an agent's last shift still reaches into
+        busy = {}
+        for agent_id, meeting in self.last_shifts.items():
+            end = _actual_end(meeting)
+            date = first_date
+            while datetime.datetime.combine(date, datetime.time(), end.tzinfo) < end:
+                busy.setdefault(agent_id, []).append(date)
+                date += datetime.timedelta(days=1)
+        return busy
+
+
+def rolling_horizon(agents: List[Agent], meetings: Iterable[Meeting], window_days: int = 7, overlap_days: int = 0,
+                    state: Optional[HorizonState] = None, **options) -> Iterator[
+        Tuple[datetime.date, Dict[Meeting, Agent], HorizonState]]:
+    # Solves `meetings` (any iterable sorted by start, e.g. a generator reading week by week) in
+    # windows of `window_days` dates, looking `overlap_days` further ahead. Only the first
+    # `window_days` of each solve are committed; the overlap is solved again, with the new
+    # night counts and last shifts, as the head of the next window. Only one window of meetings is held at a time.
+    # Yields (first date, committed schedule, state) per window; `options` go to
+    # run_scheduling_algorithm, with a `seed` offset per window.
+    if window_days < 1 or overlap_days < 0:
+        raise ValueError("window_days must be positive and overlap_days non-negative")
+    state = state if state is not None else HorizonState()
+    seed = options.pop('seed', None)
+    upcoming = iter(meetings)
+    pending = []  # meetings read but not yet committed, in start order
+    window_start = None
+    exhausted = False
+
+    def read() -> bool:
+        nonlocal exhausted
+        meeting = next(upcoming, None)
+        if meeting is None:
+            exhausted = True
+            return False
+        if pending and meeting.start < pending[-1].start:
+            raise ValueError("rolling_horizon needs meetings sorted by start")
+        pending.append(meeting)
+        return True
+
+    for window in itertools.count():
+        if not pending and (exhausted or not read()):
+            return
+        if window_start is None:
+            window_start = pending[0].start.date()
+        # Skip empty stretches on the window grid
+        while (pending[0].start.date() - window_start).days >= window_days:
+            window_start += datetime.timedelta(days=window_days)
+        # Read past the lookahead end, so the window holds every meeting it covers
+        while not exhausted and (pending[-1].start.date() - window_start).days < window_days + overlap_days:
+            read()
+
+        lookahead = [m for m in pending if (m.start.date() - window_start).days < window_days + overlap_days]
+        schedule = run_scheduling_algorithm(agents, lookahead, night_counts=state.night_counts,
+                                            busy_dates=state.busy_dates(window_start),
+                                            seed=None if seed is None else seed + window, **options)
+        committed = {m: agent for m, agent in schedule.items() if (m.start.date() - window_start).days < window_days}
+        state.commit(committed)
+        pending = [m for m in pending if (m.start.date() - window_start).days >= window_days]
+        yield window_start, committed, state
+        window_start += datetime.timedelta(days=window_days)
@@ -0,0 +1,195 @@
+import hashlib
+import io
+import json
+import os
+from typing import List, Dict, Optional, Iterator, Union, BinaryIO
+
+import numpy as np
+import pandas as pd
+
+from genetic_algorithm_V5 import Agent, Meeting
+from meeting_store_V5 import MeetingStore
+
+# Meeting files carry one row per meeting; client and title are optional
+MEETING_COLUMNS = ["start", "end", "type", "is_night", "client", "title"]
+REQUIRED_COLUMNS = ["start", "end", "type", "is_night"]
+SCHEDULE_COLUMNS = ["start", "end", "type", "is_night", "agent_id"]
+CHUNK_ROWS = 100_000
+CACHE_VERSION = 1
+
+Source = Union[str, os.PathLike, BinaryIO]
+
+
+def _format(source: Source, format: Optional[str]) -> str:
+    if format is None:
+        name = str(source) if isinstance(source, (str, os.PathLike)) else getattr(source, "name", "")
+        format = os.path.splitext(name)[1].lstrip(".").lower()
+    format = {"pq": "parquet"}.get(format, format)
+    if format not in ("csv", "parquet"):
+        raise ValueError(f"Unknown meeting file format: {format!r} (expected csv or parquet)")
+    return format
+
+
+def _parquet():
+    # pyarrow is only needed for Parquet files
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError("Reading or writing Parquet needs pyarrow: pip install pyarrow") from error
+    return pa, pq
+
+
+def _iter_chunks(source: Source, format: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if format == "csv":
+        yield from pd.read_csv(source, chunksize=chunk_rows, usecols=lambda column: column in MEETING_COLUMNS,
+                               dtype={"type": str, "client": str, "title": str})
+    else:
+        _, pq = _parquet()
+        parquet_file = pq.ParquetFile(source)
+        columns = [column for column in MEETING_COLUMNS if column in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+
+
+def _parse_bool(column: pd.Series) -> np.ndarray:
+    if column.dtype == bool:
+        return column.to_numpy()
+    return column.astype(str).str.strip().str.lower().isin(["true", "1", "yes", "y"]).to_numpy()
+
+
+class _Categories:
+    # Running string -> code table, so categorical columns are encoded chunk by chunk
+    def __init__(self):
+        self.codes = {}
+
+    def encode(self, column: pd.Series) -> np.ndarray:
+        chunk_codes, uniques = pd.factorize(column.fillna("").astype(str))
+        lookup = np.array([self.codes.setdefault(value, len(self.codes)) for value in uniques], dtype=np.int32)
+        return lookup[chunk_codes] if len(lookup) else np.zeros(len(column), dtype=np.int32)
+
+    @property
+    def values(self) -> List[str]:
+        return list(self.codes)
+
+
+def _parse(source: Source, format: str, chunk_rows: int) -> Dict:
+    # Streams the file into plain arrays: int64 nanosecond start/end, int32 category codes and
+    # a bool night flag; only one chunk of text is held at a time
+    parts = {name: [] for name in ("start", "end", "type", "client", "title", "is_night")}
+    categories = {name: _Categories() for name in ("type", "client", "title")}
+    for chunk in _iter_chunks(source, format, chunk_rows):
+        missing = [column for column in REQUIRED_COLUMNS if column not in chunk]
+        if missing:
+            raise ValueError(f"Meeting file is missing columns: {', '.join(missing)}")
+        for name in ("start", "end"):
+            # Naive wall-clock times, like the calendar events
+            parts[name].append(pd.to_datetime(chunk[name]).to_numpy(dtype="datetime64[ns]").view(np.int64))
+        for name in ("type", "client", "title"):
+            column = chunk[name] if name in chunk else pd.Series([""] * len(chunk))
+            parts[name].append(categories[name].encode(column))
+        parts["is_night"].append(_parse_bool(chunk["is_night"]))
+
+    dtypes = dict(start=np.int64, end=np.int64, type=np.int32, client=np.int32, title=np.int32, is_night=bool)
+    arrays = {name: np.concatenate(chunks) if chunks else np.empty(0, dtype=dtypes[name])
+              for name, chunks in parts.items()}
+    return dict(arrays=arrays, categories={name: table.values for name, table in categories.items()})
+
+
+def _store(parsed: Dict) -> MeetingStore:
+    arrays, categories = parsed["arrays"], parsed["categories"]
+    frame = pd.DataFrame({
+        "start": pd.to_datetime(np.asarray(arrays["start"]).view("datetime64[ns]")),
+        "end": pd.to_datetime(np.asarray(arrays["end"]).view("datetime64[ns]")),
+        "type": pd.Categorical.from_codes(np.asarray(arrays["type"]), categories["type"]),
+        "client": pd.Categorical.from_codes(np.asarray(arrays["client"]), categories["client"]),
+        "is_night": np.asarray(arrays["is_night"], dtype=bool),
+    })
+    if any(categories["title"]):
+        frame["title"] = pd.Categorical.from_codes(np.asarray(arrays["title"]), categories["title"]).astype(str)
+    return MeetingStore(frame)
+
+
+def _cache_path(cache_dir: str, path: str) -> str:
+    # Keyed by the file's identity, so an edited file is parsed again
+    stat = os.stat(path)
+    identity = json.dumps([CACHE_VERSION, os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+    return os.path.join(cache_dir, hashlib.sha256(identity.encode()).hexdigest()[:32])
+
+
+def _load_cached(directory: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(directory, "categories.json")) as f:
+            categories = json.load(f)
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+                  for name in ("start", "end", "type", "client", "title", "is_night")}
+    except (OSError, ValueError):
+        return None
+    return dict(arrays=arrays, categories=categories)
+
+
+def _save_cached(directory: str, parsed: Dict):
+    # Arrays first and the categories file last, so a half-written entry is never loaded
+    os.makedirs(directory, exist_ok=True)
+    for name, array in parsed["arrays"].items():
+        np.save(os.path.join(directory, f"{name}.npy"), array)
+    with open(os.path.join(directory, "categories.json"), "w") as f:
+        json.dump(parsed["categories"], f)
+
+
+def read_meetings(source: Source, format: Optional[str] = None, chunk_rows: int = CHUNK_ROWS,
+                  cache_dir: Optional[str] = None) -> MeetingStore:
+    # `source` is a path or a binary file object (e.g. a Streamlit upload). With `cache_dir`, the
+    # parsed arrays of a path are kept as .npy files and memory-mapped on the next load.
+    format = _format(source, format)
+    cache_entry = None
+    if cache_dir is not None and isinstance(source, (str, os.PathLike)):
+        cache_entry = _cache_path(cache_dir, os.fspath(source))
+        parsed = _load_cached(cache_entry)
+        if parsed is not None:
+            return _store(parsed)
+
+    parsed = _parse(source, format, chunk_rows)
+    if cache_entry is not None:
+        _save_cached(cache_entry, parsed)
+    return _store(parsed)
+
+
+def schedule_frame(schedule: Dict[Meeting, Agent], meetings: Optional[List[Meeting]] = None) -> pd.DataFrame:
+    # One row per meeting; with `meetings`, unassigned ones are kept with an empty agent_id
+    if meetings is None:
+        meetings = list(schedule)
+    agent_ids = [schedule[m].id if m in schedule else None for m in meetings]
+    return pd.DataFrame({
+        "start": pd.to_datetime([m.start for m in meetings]),
+        "end": pd.to_datetime([m.end for m in meetings]),
+        "type": [m.required_skill for m in meetings],
+        "is_night": np.array([m.is_night for m in meetings], dtype=bool),
+        "agent_id": pd.array(agent_ids, dtype="Int64"),
+    }, columns=SCHEDULE_COLUMNS)
+
+
+def write_schedule(schedule: Dict[Meeting, Agent], target: Source, format: Optional[str] = None,
+                   meetings: Optional[List[Meeting]] = None, chunk_rows: int = CHUNK_ROWS):
+    format = _format(target, format)
+    frame = schedule_frame(schedule, meetings)
+    if format == "csv":
+        if isinstance(target, (str, os.PathLike)):
+            frame.to_csv(target, index=False, chunksize=chunk_rows, date_format="%Y-%m-%dT%H:%M:%S")
+        else:
+            target.write(frame.to_csv(index=False, chunksize=chunk_rows,
+                                      date_format="%Y-%m-%dT%H:%M:%S").encode())
+    else:
+        pa, pq = _parquet()
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        with pq.ParquetWriter(target, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=chunk_rows):
+                writer.write_batch(batch)
+
+
+def schedule_bytes(schedule: Dict[Meeting, Agent], format: str,
+                   meetings: Optional[List[Meeting]] = None) -> bytes:
+    # For download buttons
+    buffer = io.BytesIO()
+    write_schedule(schedule, buffer, format, meetings)
+    return buffer.getvalue()
@@ -0,0 +1,98 @@
+from typing import List, Dict, Optional, Iterable
+
+import numpy as np
+import pandas as pd
+
+from genetic_algorithm_V5 import Meeting
+
+# Evening hour from which a meeting counts as a night appointment in the summary
+NIGHT_START_HOUR = 20
+
+
+class MeetingStore:
+    # Meetings parsed once into columns: datetime64 start/end, categorical type and client, an
+    # is_night flag and the start date. Rows stay aligned with the calendar events, so the
+    # pages can hand subsets to the calendar component without re-formatting them.
+    def __init__(self, frame: pd.DataFrame, events: Optional[List[Dict]] = None):
+        # `frame` needs start, end, type, client and is_night columns; `events` are the matching
+        # calendar dicts, built from the columns on first use when not given
+        frame = frame.reset_index(drop=True)
+        if "title" not in frame:
+            frame["title"] = frame["client"].astype(str) + ": " + frame["type"].astype(str)
+        self.events = events
+        frame["date"] = frame["start"].dt.normalize()
+        # Night meetings may end after midnight while keeping the start date, so the end can
+        # come before the start; the duration wraps around the day instead of going negative
+        frame["hours"] = ((frame["end"] - frame["start"]) % pd.Timedelta(days=1)) / pd.Timedelta(hours=1)
+        self.frame = frame
+        self._meetings = None
+
+    @classmethod
+    def from_events(cls, events: List[Dict]) -> 'MeetingStore':
+        frame = pd.DataFrame({
+            "title": [event.get("title", "") for event in events],
+            "start": pd.to_datetime([event["start"] for event in events]),
+            "end": pd.to_datetime([event["end"] for event in events]),
+            "type": pd.Categorical([event["type"] for event in events]),
+            "client": pd.Categorical([event.get("client", "") for event in events]),
+            "is_night": np.array([bool(event["is_night"]) for event in events], dtype=bool),
+        })
+        return cls(frame, events)
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def clients(self) -> List[str]:
+        return sorted(self.frame["client"].cat.categories)
+
+    @property
+    def types(self) -> List[str]:
+        return sorted(self.frame["type"].cat.categories)
+
+    def select(self, clients: Optional[Iterable[str]] = None, types: Optional[Iterable[str]] = None) -> np.ndarray:
+        # Row positions matching the filters, in event order
+        mask = np.ones(len(self.frame), dtype=bool)
+        if clients is not None:
+            mask &= self.frame["client"].isin(list(clients)).to_numpy()
+        if types is not None:
+            mask &= self.frame["type"].isin(list(types)).to_numpy()
+        return np.flatnonzero(mask)
+
+    def to_events(self, positions: Optional[np.ndarray] = None) -> List[Dict]:
+        if self.events is None:
+            frame = self.frame
+            self.events = [
+                {"title": title, "start": start, "end": end, "client": client, "type": skill, "is_night": is_night}
+                for title, start, end, client, skill, is_night in zip(
+                    frame["title"].tolist(), frame["start"].dt.strftime("%Y-%m-%dT%H:%M:%S").tolist(),
+                    frame["end"].dt.strftime("%Y-%m-%dT%H:%M:%S").tolist(), frame["client"].astype(str).tolist(),
+                    frame["type"].astype(str).tolist(), frame["is_night"].tolist())]
+        if positions is None:
+            return list(self.events)
+        return [self.events[i] for i in positions.tolist()]
+
+    def meetings(self, positions: Optional[np.ndarray] = None) -> List[Meeting]:
+        # Meeting objects are built once and reused, so schedules keyed by them survive reruns
+        if self._meetings is None:
+            starts = self.frame["start"].dt.to_pydatetime()
+            ends = self.frame["end"].dt.to_pydatetime()
+            self._meetings = [Meeting(start, end, skill, is_night) for start, end, skill, is_night in
+                              zip(starts, ends, self.frame["type"].astype(str), self.frame["is_night"].tolist())]
+        if positions is None:
+            return list(self._meetings)
+        return [self._meetings[i] for i in positions.tolist()]
+
+    def daily_summary(self, positions: Optional[np.ndarray] = None) -> pd.DataFrame:
+        # Hours, appointment counts and day/night split per date, over the selected rows
+        frame = self.frame if positions is None else self.frame.iloc[positions]
+        night = frame["is_night"] | (frame["start"].dt.hour >= NIGHT_START_HOUR)
+        grouped = frame.assign(night=night).groupby("date")
+        summary = pd.DataFrame({
+            "Total Hours": grouped["hours"].sum(),
+            "Required Agents": grouped.size(),
+            "Night Appointments (After 8PM)": grouped["night"].sum().astype(int),
+        })
+        summary.insert(2, "Day Appointments (6AM-8PM)",
+                       summary["Required Agents"] - summary["Night Appointments (After 8PM)"])
+        return summary
@@ -1,11 +1,13 @@
 import streamlit as st
-from genetic_algorithm_V5 import Agent, Meeting, run_scheduling_algorithm
-import datetime
+from genetic_algorithm_V5 import Agent
+from background_solver_V5 import BackgroundSolve
+from result_cache_V5 import ResultCache
+import time
 
 def show_schedule_generation():
     st.title("Schedule Generation V5")
 
-    if 'meetings' not in st.session_state:
+    if 'meetings' not in st.session_state or 'meeting_store' not in st.session_state:
         st.warning("Please generate meetings in the Meeting Management page first.")
         return
 
@@ -22,18 +24,51 @@ def show_schedule_generation():
     for agent in agents:
         st.write(f"Agent {agent.id}: {', '.join(agent.skills)}")
 
-    # Convert meetings from calendar events to Meeting objects
-    meetings = []
-    for event in st.session_state.meetings:
-        start = datetime.datetime.fromisoformat(event['start'])
-        end = datetime.datetime.fromisoformat(event['end'])
-        meetings.append(Meeting(start, end, event['type'], event['is_night']))
-
-    if st.button("Generate Schedule"):
-        with st.spinner("Generating schedule..."):
-            final_schedule = run_scheduling_algorithm(agents, meetings)
-            st.session_state.final_schedule = final_schedule
-            st.success("Schedule generated successfully!")
+    # Meeting objects of the rows selected on the Meeting Management page
+    meetings = st.session_state.meeting_store.meetings(st.session_state.meetings)
+
+    time_budget = st.number_input("Time budget (seconds)", min_value=1.0, max_value=600.0, value=10.0, step=1.0)
+    stall_generations = st.number_input("Stop after generations without improvement", min_value=1, value=50)
+    warm_start = st.checkbox("Keep previous assignments for unchanged meetings",
+                             value='final_schedule' in st.session_state,
+                             disabled='final_schedule' not in st.session_state)
+
+    solver = st.session_state.get('solver')
+    if solver is None:
+        if st.button("Generate Schedule"):
+            previous_schedule = st.session_state.final_schedule if warm_start else None
+            st.session_state.solver = BackgroundSolve(agents, meetings, generations=None, time_limit=time_budget,
+                                                      stall_generations=int(stall_generations),
+                                                      previous_schedule=previous_schedule,
+                                                      result_cache=ResultCache()).start()
+            st.experimental_rerun()
+    elif solver.running:
+        status = solver.status()
+        st.progress(status['fraction'] or 0.0)
+        if status['generation'] is None:
+            st.write("Assigning night shifts...")
+        else:
+            eta = f", about {status['eta']:.0f}s left" if status['eta'] is not None else ""
+            st.write(f"Generation {status['generation']}, best fitness {status['best_fitness']:.1f}, "
+                     f"{status['elapsed']:.0f}s elapsed{eta}")
+        if solver.cancelled:
+            st.info("Cancelling, keeping the best schedule found so far...")
+        elif st.button("Cancel"):
+            solver.cancel()
+        time.sleep(0.5)
+        st.experimental_rerun()
+    else:
+        del st.session_state.solver
+        if solver.error is not None:
+            st.error(f"Schedule generation failed: {solver.error}")
+        else:
+            st.session_state.final_schedule = solver.result
+            st.session_state.unassigned_meetings = [m for m in solver.meetings if m not in solver.result]
+            st.session_state.logbook = solver.logbook
+            if solver.cancelled:
+                st.warning("Schedule generation cancelled; showing the best schedule found so far.")
+            else:
+                st.success("Schedule generated successfully!")
 
     if 'final_schedule' in st.session_state:
         st.subheader("Generated Schedule")
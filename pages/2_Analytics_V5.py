@@ -44,20 +44,34 @@ if 'schedules' in st.session_state:
     col1.metric("Total Appointments", metrics["total_appointments"])
     col2.metric("Mismatched Skills", metrics["mismatched_skills"])
 
-    st.subheader("Fitness Over Generations")
-    if 'logbook' in st.session_state:
-        gen = st.session_state.logbook.select("gen")
-        fit_mins = st.session_state.logbook.select("min")
-        fit_maxs = st.session_state.logbook.select("max")
-        fit_avgs = st.session_state.logbook.select("avg")
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=gen, y=fit_mins, mode='lines', name='Min Fitness'))
-        fig.add_trace(go.Scatter(x=gen, y=fit_maxs, mode='lines', name='Max Fitness'))
-        fig.add_trace(go.Scatter(x=gen, y=fit_avgs, mode='lines', name='Avg Fitness'))
-        fig.update_layout(title='Fitness over Generations', xaxis_title='Generation', yaxis_title='Fitness')
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.warning("No fitness data available. Please generate a schedule first.")
 else:
-    st.warning("No schedule generated yet. Please go to the Schedule Generation page.")
\ No newline at end of file
+    st.warning("No schedule generated yet. Please go to the Schedule Generation page.")
+
+st.subheader("Fitness Over Generations")
+if 'logbook' in st.session_state and len(st.session_state.logbook):
+    logbook = st.session_state.logbook
+    gen = logbook.select("gen")
+    fit_mins = logbook.select("min")
+    fit_maxs = logbook.select("max")
+    fit_avgs = logbook.select("avg")
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=gen, y=fit_mins, mode='lines', name='Min Fitness'))
+    fig.add_trace(go.Scatter(x=gen, y=fit_maxs, mode='lines', name='Max Fitness'))
+    fig.add_trace(go.Scatter(x=gen, y=fit_avgs, mode='lines', name='Avg Fitness'))
+    fig.update_layout(title='Fitness over Generations', xaxis_title='Generation', yaxis_title='Fitness')
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Time per Generation")
+    fig = go.Figure()
+    for phase in ["evaluate", "select", "crossover", "mutate", "repair"]:
+        fig.add_trace(go.Bar(x=gen, y=logbook.select(f"time_{phase}"), name=phase.capitalize()))
+    fig.update_layout(barmode='stack', title='Phase Timings', xaxis_title='Generation', yaxis_title='Seconds')
+    st.plotly_chart(fig, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    col1.download_button("Download logbook (CSV)", logbook.to_csv(), file_name="logbook.csv", mime="text/csv")
+    col2.download_button("Download logbook (JSON)", logbook.to_json(), file_name="logbook.json",
+                         mime="application/json")
+else:
+    st.warning("No fitness data available. Please generate a schedule first.")
@@ -3,6 +3,8 @@ from streamlit_calendar import calendar
 import datetime
 import random
 import pandas as pd
+from meeting_store_V5 import MeetingStore
+from meeting_io_V5 import read_meetings
 
 # Define meeting types and their properties
 meeting_types = {
@@ -55,13 +57,22 @@ def generate_meetings(start_date, num_clients=5):
 def show_meeting_management():
     st.title("Meeting Management V5")
 
-    if 'calendar_events' not in st.session_state:
+    if 'meeting_store' not in st.session_state:
         today = datetime.date.today()
         start_of_week = today - datetime.timedelta(days=today.weekday())
-        st.session_state.calendar_events = generate_meetings(start_of_week)
+        st.session_state.meeting_store = MeetingStore.from_events(generate_meetings(start_of_week))
 
-    all_clients = sorted(set(event['client'] for event in st.session_state.calendar_events))
-    all_types = sorted(list(meeting_types.keys()))
+    uploaded = st.file_uploader("Load meetings (CSV or Parquet)", type=["csv", "parquet"])
+    if uploaded is not None and st.session_state.get('meeting_file') != (uploaded.name, uploaded.size):
+        try:
+            st.session_state.meeting_store = read_meetings(uploaded)
+            st.session_state.meeting_file = (uploaded.name, uploaded.size)
+        except (ValueError, ImportError) as error:
+            st.error(f"Could not load {uploaded.name}: {error}")
+    store = st.session_state.meeting_store
+
+    all_clients = store.clients
+    all_types = store.types
 
     col1, col2 = st.columns(2)
     with col1:
@@ -69,10 +80,8 @@ def show_meeting_management():
     with col2:
         selected_types = st.multiselect("Select Appointment Types", all_types, default=all_types)
 
-    filtered_events = [
-        event for event in st.session_state.calendar_events
-        if event['client'] in selected_clients and event['type'] in selected_types
-    ]
+    selection = store.select(selected_clients, selected_types)
+    filtered_events = store.to_events(selection)
 
     calendar_options = {
         "headerToolbar": {
@@ -114,38 +123,23 @@ def show_meeting_management():
         st.write(f"End: {event['end']}")
 
     st.subheader("Summary Table")
-    summary_data = []
-    start_date = min(datetime.datetime.fromisoformat(event['start']).date() for event in filtered_events)
-
-    for day in range(7):
-        current_date = start_date + datetime.timedelta(days=day)
-        day_events = [event for event in filtered_events if
-                      datetime.datetime.fromisoformat(event['start']).date() == current_date]
-
-        total_hours = sum(meeting_types[event['type']]['duration'] for event in day_events)
-        required_agents = len(day_events)
-        night_appointments = sum(1 for event in day_events if event['is_night'] or int(event['start'].split('T')[1].split(':')[0]) >= 20)
-        day_appointments = required_agents - night_appointments
-
-        summary_data.append({
-            "Date": current_date.strftime("%Y-%m-%d"),
-            "Total Hours": total_hours,
-            "Required Agents": required_agents,
-            "Day Appointments (6AM-8PM)": day_appointments,
-            "Night Appointments (After 8PM)": night_appointments
-        })
-
-    summary_df = pd.DataFrame(summary_data)
-    st.table(summary_df)
+    summary_df = store.daily_summary(selection)
+    if len(summary_df):
+        # Days without selected meetings show as zero rows, over the whole span of the selection
+        days = pd.date_range(summary_df.index.min(), summary_df.index.max())
+        summary_df = summary_df.reindex(days, fill_value=0)
+    summary_df.index = summary_df.index.strftime("%Y-%m-%d")
+    st.table(summary_df.rename_axis("Date").reset_index())
 
     if st.button("Generate New Events"):
         today = datetime.date.today()
         start_of_week = today - datetime.timedelta(days=today.weekday())
-        st.session_state.calendar_events = generate_meetings(start_of_week)
+        st.session_state.meeting_store = MeetingStore.from_events(generate_meetings(start_of_week))
+        st.session_state.pop('meeting_file', None)
         st.experimental_rerun()
 
-    # Store the generated meetings in the session state for use in the genetic algorithm
-    st.session_state.meetings = filtered_events
+    # Store the selected rows of the meeting store for use in the genetic algorithm
+    st.session_state.meetings = selection
 
 if __name__ == "__main__":
     show_meeting_management()
\ No newline at end of file
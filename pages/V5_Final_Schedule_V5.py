@@ -2,6 +2,7 @@ import streamlit as st
 from streamlit_calendar import calendar
 import datetime
 import pandas as pd
+from meeting_io_V5 import schedule_bytes, schedule_frame
 
 def show_final_schedule():
     st.title("Final Schedule with Assigned Agents")
@@ -12,16 +13,35 @@ def show_final_schedule():
 
     final_schedule = st.session_state.final_schedule
 
-    # Prepare events for the calendar
-    events = []
-    for meeting, agent in final_schedule.items():
-        events.append({
-            "title": f"Agent {agent.id}: {meeting.required_skill}",
-            "start": meeting.start.isoformat(),
-            "end": meeting.end.isoformat(),
-            "backgroundColor": "#FF9999" if meeting.is_night else "#99FF99",
-            "borderColor": "#FF9999" if meeting.is_night else "#99FF99",
-        })
+    # One assignments table per schedule, kept across reruns
+    cached = st.session_state.get('final_schedule_frame')
+    if cached is None or cached[0] is not final_schedule:
+        st.session_state.final_schedule_frame = (final_schedule, schedule_frame(final_schedule))
+    frame = st.session_state.final_schedule_frame[1]
+
+    # Only the visible date range and agents are sent to the calendar
+    first_day = frame["start"].min().date() if len(frame) else datetime.date.today()
+    last_day = frame["start"].max().date() if len(frame) else first_day
+    col1, col2 = st.columns(2)
+    with col1:
+        week_end = min(last_day, first_day + datetime.timedelta(days=6))
+        visible = st.date_input("Visible dates", value=(first_day, week_end), min_value=first_day,
+                                max_value=last_day)
+    with col2:
+        agent_ids = sorted(frame["agent_id"].dropna().unique().tolist())
+        selected_agents = st.multiselect("Agents", agent_ids, default=agent_ids)
+    range_start, range_end = (visible[0], visible[-1]) if isinstance(visible, (tuple, list)) else (visible, visible)
+    shown = frame[(frame["start"] >= pd.Timestamp(range_start)) &
+                  (frame["start"] < pd.Timestamp(range_end) + pd.Timedelta(days=1)) &
+                  frame["agent_id"].isin(selected_agents)]
+
+    colors = ["#FF9999" if is_night else "#99FF99" for is_night in shown["is_night"].tolist()]
+    events = [{"title": f"Agent {agent_id}: {skill}", "start": start, "end": end,
+               "backgroundColor": color, "borderColor": color}
+              for agent_id, skill, start, end, color in zip(
+                  shown["agent_id"].tolist(), shown["type"].tolist(),
+                  shown["start"].dt.strftime("%Y-%m-%dT%H:%M:%S").tolist(),
+                  shown["end"].dt.strftime("%Y-%m-%dT%H:%M:%S").tolist(), colors)]
 
     calendar_options = {
         "headerToolbar": {
@@ -38,6 +58,7 @@ def show_final_schedule():
         "allDaySlot": False,
         "scrollTime": "08:00:00",
         "nowIndicator": True,
+        "initialDate": range_start.isoformat(),
     }
 
     custom_css = """
@@ -50,7 +71,7 @@ def show_final_schedule():
     st.write(cal)
 
     # Display warnings for unassigned meetings
-    unassigned_meetings = [meeting for meeting, agent in final_schedule.items() if agent is None]
+    unassigned_meetings = st.session_state.get('unassigned_meetings', [])
     if unassigned_meetings:
         st.subheader("Unassigned Meetings")
         for meeting in unassigned_meetings:
@@ -58,27 +79,29 @@ def show_final_schedule():
 
     # Display agent workload summary
     st.subheader("Agent Workload Summary")
-    agent_workload = {}
-    for meeting, agent in final_schedule.items():
-        if agent:
-            if agent.id not in agent_workload:
-                agent_workload[agent.id] = {"total_hours": 0, "night_hours": 0}
-            duration = (meeting.end - meeting.start).total_seconds() / 3600
-            agent_workload[agent.id]["total_hours"] += duration
-            if meeting.is_night:
-                agent_workload[agent.id]["night_hours"] += duration
-
-    workload_data = []
-    for agent_id, workload in agent_workload.items():
-        workload_data.append({
-            "Agent ID": agent_id,
-            "Total Hours": round(workload["total_hours"], 2),
-            "Day Hours": round(workload["total_hours"] - workload["night_hours"], 2),
-            "Night Hours": round(workload["night_hours"], 2)
-        })
-
-    workload_df = pd.DataFrame(workload_data)
+    hours = (frame["end"] - frame["start"]).dt.total_seconds() / 3600
+    workload = frame.assign(total_hours=hours, night_hours=hours.where(frame["is_night"], 0.0)) \
+        .groupby("agent_id", sort=False)[["total_hours", "night_hours"]].sum()
+    workload_df = pd.DataFrame({
+        "Agent ID": workload.index,
+        "Total Hours": workload["total_hours"].round(2).to_numpy(),
+        "Day Hours": (workload["total_hours"] - workload["night_hours"]).round(2).to_numpy(),
+        "Night Hours": workload["night_hours"].round(2).to_numpy(),
+    })
     st.table(workload_df)
 
+    st.subheader("Export")
+    meetings = list(final_schedule) + unassigned_meetings
+    col1, col2 = st.columns(2)
+    col1.download_button("Download schedule (CSV)", schedule_bytes(final_schedule, "csv", meetings),
+                         file_name="schedule.csv", mime="text/csv")
+    try:
+        parquet = schedule_bytes(final_schedule, "parquet", meetings)
+    except ImportError:
+        col2.caption("Install pyarrow to export Parquet.")
+    else:
+        col2.download_button("Download schedule (Parquet)", parquet, file_name="schedule.parquet",
+                             mime="application/octet-stream")
+
 if __name__ == "__main__":
     show_final_schedule()
\ No newline at end of file
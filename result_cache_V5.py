@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import List, Dict, Optional
+
+from genetic_algorithm_V5 import Agent, Meeting
+
+CACHE_VERSION = 1
+
+
+def _canonical_meetings(meetings: List[Meeting]) -> List[int]:
+    # Positions of `meetings` in canonical order, so the key does not depend on list order
+    return sorted(range(len(meetings)), key=lambda i: (meetings[i].start.isoformat(), meetings[i].end.isoformat(),
+                                                       meetings[i].required_skill, meetings[i].is_night))
+
+
+class ResultCache:
+    # Solved schedules on local disk, one JSON file per problem fingerprint. Reads refresh a
+    # file's mtime and writes evict the least recently used files beyond `max_bytes`.
+    def __init__(self, directory: str = ".schedule_cache", max_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(agents: List[Agent], meetings: List[Meeting], params: Dict) -> str:
+        payload = {
+            "version": CACHE_VERSION,
+            "agents": sorted([agent.id, sorted(agent.skills)] for agent in agents),
+            "meetings": [[meetings[i].start.isoformat(), meetings[i].end.isoformat(), meetings[i].required_skill,
+                          meetings[i].is_night] for i in _canonical_meetings(meetings)],
+            "params": params,
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str, agents: List[Agent], meetings: List[Meeting]) -> Optional[Dict[Meeting, Agent]]:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                assignments = json.load(f)["assignments"]
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+
+        agents_by_id = {agent.id: agent for agent in agents}
+        order = _canonical_meetings(meetings)
+        if len(assignments) != len(order) or any(a is not None and a not in agents_by_id for a in assignments):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return {meetings[i]: agents_by_id[a] for i, a in zip(order, assignments) if a is not None}
+
+    def put(self, key: str, meetings: List[Meeting], schedule: Dict[Meeting, Agent]):
+        assignments = [schedule[meetings[i]].id if meetings[i] in schedule else None
+                       for i in _canonical_meetings(meetings)]
+        # Write to a temporary file first so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"version": CACHE_VERSION, "assignments": assignments}, f)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,167 @@
+import datetime
+import random
+from fractions import Fraction
+from typing import List, Dict
+
+import pytest
+
+from genetic_algorithm_V5 import (Agent, Meeting, SchedulingProblem, IncrementalFitness, FitnessCache, UNASSIGNED,
+                                  fitness, batch_fitness, score_population, genetic_algorithm)
+
+SKILLS = ["Fire", "Security", "Maintenance", "Monitoring"]
+
+
+def baseline_fitness(schedule: Dict[Meeting, Agent], agents: List[Agent], hours=lambda seconds: seconds / 3600):
+    # The original pairwise implementation, kept as the reference oracle. With
+    # hours=Fraction-based seconds it is evaluated exactly instead of in floats.
+    score = 0
+    agent_schedules = {agent: {} for agent in agents}
+
+    for meeting, agent in schedule.items():
+        if meeting.required_skill not in agent.skills and meeting.required_skill != 'Monitoring':
+            score -= 100
+
+        date = meeting.start.date()
+        if date not in agent_schedules[agent]:
+            agent_schedules[agent][date] = []
+        agent_schedules[agent][date].append(meeting)
+
+        # Check for overlapping meetings
+        for other_meeting in agent_schedules[agent][date]:
+            if meeting != other_meeting and (meeting.start < other_meeting.end and meeting.end > other_meeting.start):
+                score -= 50
+
+    for agent, dates in agent_schedules.items():
+        for date, meetings in dates.items():
+            work_hours = sum(hours((meeting.end - meeting.start).seconds) for meeting in meetings)
+            if work_hours > 8:
+                score -= (work_hours - 8) * 10
+
+            # Check for proper breaks
+            sorted_meetings = sorted(meetings, key=lambda m: m.start)
+            for i in range(len(sorted_meetings) - 1):
+                break_time = hours((sorted_meetings[i + 1].start - sorted_meetings[i].end).seconds)
+                if break_time < 0.5:  # Less than 30 minutes break
+                    score -= 25
+
+    return score
+
+
+def exact_fitness(schedule: Dict[Meeting, Agent], agents: List[Agent]) -> float:
+    return float(baseline_fitness(schedule, agents, hours=lambda seconds: Fraction(seconds, 3600)))
+
+
+def make_instance(seed: int, num_meetings: int = 60, num_days: int = 3, minutes: int = 15):
+    # Starts and durations are multiples of `minutes`. About one meeting in twenty has zero
+    # length and one in ten ends before it starts, like the page's night meetings that cross
+    # midnight; both also produce negative gaps between neighbours.
+    rng = random.Random(seed)
+    agents = [Agent(i, rng.sample(SKILLS[:3], rng.randint(1, 2))) for i in range(rng.randint(1, 5))]
+    origin = datetime.datetime(2024, 5, 1)
+    meetings = []
+    for _ in range(num_meetings):
+        start = origin + datetime.timedelta(days=rng.randrange(num_days),
+                                            minutes=minutes * rng.randrange(24 * 60 // minutes))
+        kind = rng.random()
+        if kind < 0.05:
+            end = start
+        elif kind < 0.15:
+            end = start - datetime.timedelta(minutes=minutes * rng.randint(1, 600 // minutes))
+        else:
+            end = start + datetime.timedelta(minutes=minutes * rng.randint(1, 600 // minutes))
+        meetings.append(Meeting(start, end, rng.choice(SKILLS), rng.random() < 0.2))
+    return agents, meetings
+
+
+def random_schedules(agents: List[Agent], meetings: List[Meeting], seed: int, count: int = 5):
+    rng = random.Random(seed)
+    return [{meeting: rng.choice(agents) for meeting in meetings if rng.random() < 0.9} for _ in range(count)]
+
+
+def engine_scores(schedule: Dict[Meeting, Agent], agents: List[Agent], meetings: List[Meeting]) -> List[float]:
+    problem = SchedulingProblem(agents, meetings)
+    genome = problem.encode(schedule)
+    return [fitness(schedule, agents), fitness(schedule, agents, problem.skill_index),
+            float(batch_fitness(genome, problem)[0]), IncrementalFitness(problem, genome).score]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_quarter_hours_match_baseline_exactly(seed):
+    agents, meetings = make_instance(seed)
+    for schedule in random_schedules(agents, meetings, seed):
+        expected = baseline_fitness(schedule, agents)
+        assert engine_scores(schedule, agents, meetings) == [expected] * 4
+
+
+@pytest.mark.parametrize("minutes", [1, 10, 20])
+@pytest.mark.parametrize("seed", range(20))
+def test_arbitrary_minutes_match_exact_oracle(seed, minutes):
+    # Float baseline totals depend on summation order here; every engine returns the exact
+    # total correctly rounded instead
+    agents, meetings = make_instance(seed, minutes=minutes)
+    for schedule in random_schedules(agents, meetings, seed):
+        expected = exact_fitness(schedule, agents)
+        assert engine_scores(schedule, agents, meetings) == [expected] * 4
+        assert expected == pytest.approx(baseline_fitness(schedule, agents), abs=1e-9)
+
+
+def test_degenerate_meetings():
+    day = datetime.datetime(2024, 5, 1)
+    agent = Agent(0, ["Fire"])
+    meetings = [
+        Meeting(day.replace(hour=10), day.replace(hour=10), "Fire", False),  # zero length, inside the next
+        Meeting(day.replace(hour=9), day.replace(hour=12), "Fire", False),
+        Meeting(day.replace(hour=23), day.replace(hour=2), "Fire", True),  # crosses midnight
+        Meeting(day.replace(hour=22), day.replace(hour=23, minute=7), "Fire", True),
+        Meeting(day.replace(hour=11, minute=50), day.replace(hour=11, minute=59), "Security", False),
+    ]
+    schedule = {meeting: agent for meeting in meetings}
+    expected = baseline_fitness(schedule, [agent])
+    assert engine_scores(schedule, [agent], meetings) == [exact_fitness(schedule, [agent])] * 4
+    assert expected == pytest.approx(exact_fitness(schedule, [agent]), abs=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_incremental_updates_do_not_drift(seed):
+    agents, meetings = make_instance(seed, minutes=1)
+    problem = SchedulingProblem(agents, meetings)
+    rng = random.Random(seed)
+    individual = IncrementalFitness(problem, problem.encode(random_schedules(agents, meetings, seed, 1)[0]))
+    for _ in range(200):
+        individual.apply({rng.randrange(len(meetings)): rng.choice([UNASSIGNED, *range(len(agents))])
+                          for _ in range(3)})
+    schedule = problem.decode(individual.genome)
+    assert individual.score == fitness(schedule, agents) == exact_fitness(schedule, agents)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_seeded_runs_agree_across_engines(seed):
+    # 20/50/70/100 minute meetings, where float rounding used to reorder rankings
+    rng = random.Random(seed)
+    agents = [Agent(i, rng.sample(SKILLS[:3], 2)) for i in range(4)]
+    origin = datetime.datetime(2024, 5, 1)
+    meetings = []
+    for _ in range(60):
+        start = origin + datetime.timedelta(days=rng.randrange(2), minutes=5 * rng.randrange(24 * 12))
+        meetings.append(Meeting(start, start + datetime.timedelta(minutes=rng.choice([20, 50, 70, 100])),
+                                rng.choice(SKILLS), False))
+    results = []
+    for options in ({}, {"vectorized": True}, {"delta": True}):
+        random.seed(seed)
+        results.append(list(genetic_algorithm(agents, meetings, 20, 10, 0.1, **options).items()))
+    assert results[0] == results[1] == results[2]
+
+
+def test_shared_cache_keeps_problems_apart():
+    day = datetime.datetime(2024, 5, 1)
+    agents = [Agent(0, ["Fire"])]
+    overlapping = [Meeting(day.replace(hour=9), day.replace(hour=11), "Fire", False),
+                   Meeting(day.replace(hour=10), day.replace(hour=12), "Fire", False)]
+    apart = [Meeting(day.replace(hour=9), day.replace(hour=10), "Fire", False),
+             Meeting(day.replace(hour=14), day.replace(hour=15), "Fire", False)]
+    genome = SchedulingProblem(agents, apart).encode({meeting: agents[0] for meeting in apart})
+    cache = FitnessCache()
+    for meetings in (overlapping, apart, overlapping):
+        problem = SchedulingProblem(agents, meetings)
+        assert score_population([genome], problem, cache)[0] == batch_fitness(genome, problem)[0]
+    assert cache.hits == 1
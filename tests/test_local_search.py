@@ -0,0 +1,90 @@
+import datetime
+import random
+
+import numpy as np
+import pytest
+
+from genetic_algorithm_V5 import (Agent, Meeting, SchedulingProblem, IncrementalFitness, IntervalIndex, GENOME_DTYPE,
+                                  UNASSIGNED, local_search, fitness, _MIN_BREAK_US, _MAX_WORK_SECONDS,
+                                  _UNITS_PER_POINT)
+from tests.test_fitness import make_instance
+
+
+def brute_force_is_free(problem: SchedulingProblem, genome: np.ndarray, agent: int, i: int) -> bool:
+    same_day = [j for j in range(len(genome)) if genome[j] == agent and problem.days[j] == problem.days[i]]
+    if sum(int(problem.durations[j]) for j in same_day) + problem.durations[i] > _MAX_WORK_SECONDS:
+        return False
+    return all(problem.starts[j] >= problem.ends[i] + _MIN_BREAK_US or
+               problem.ends[j] + _MIN_BREAK_US <= problem.starts[i] for j in same_day)
+
+
+def test_is_free_sees_a_long_earlier_meeting():
+    day = datetime.datetime(2024, 5, 1)
+    meetings = [Meeting(day.replace(hour=9), day.replace(hour=13), "Fire", False),
+                Meeting(day.replace(hour=9, minute=30), day.replace(hour=10), "Fire", False),
+                Meeting(day.replace(hour=11), day.replace(hour=11, minute=30), "Fire", False)]
+    problem = SchedulingProblem([Agent(0, ["Fire"])], meetings)
+    index = IntervalIndex(problem, np.array([0, 0, UNASSIGNED], dtype=GENOME_DTYPE))
+    assert not index.is_free(0, 2)
+
+
+def short_day(seed: int):
+    # One day of mostly short meetings and a few long ones, so the 8 hour limit rarely decides and
+    # long meetings often span later, shorter ones
+    rng = random.Random(seed)
+    agents = [Agent(i, ["Fire"]) for i in range(rng.randint(1, 3))]
+    day = datetime.datetime(2024, 5, 1, 6)
+    meetings = []
+    for _ in range(20):
+        start = day + datetime.timedelta(minutes=5 * rng.randrange(14 * 12))
+        minutes = rng.choice([15, 30, 45, 60, 240])
+        meetings.append(Meeting(start, start + datetime.timedelta(minutes=minutes), "Fire", False))
+    return agents, meetings
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_is_free_matches_brute_force(seed):
+    agents, meetings = short_day(seed)
+    problem = SchedulingProblem(agents, meetings)
+    rng = random.Random(seed)
+    genome = np.array([rng.randrange(len(agents)) if rng.random() < 0.5 else UNASSIGNED for _ in meetings],
+                      dtype=GENOME_DTYPE)
+    index = IntervalIndex(problem, genome)
+    # Moves keep the index in step with the genome
+    for i in rng.sample(range(len(meetings)), 5):
+        if genome[i] != UNASSIGNED:
+            index.remove(i, int(genome[i]))
+            genome[i] = rng.randrange(len(agents))
+            index.add(i, int(genome[i]))
+    for i in range(len(meetings)):
+        for agent in range(len(agents)):
+            assert index.is_free(agent, i) == brute_force_is_free(problem, genome, agent, i)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_move_gain_matches_apply(seed):
+    agents, meetings = make_instance(seed, minutes=1)
+    problem = SchedulingProblem(agents, meetings)
+    rng = random.Random(seed)
+    individual = IncrementalFitness(problem, np.array([rng.choice([UNASSIGNED, *range(len(agents))])
+                                                       for _ in meetings], dtype=GENOME_DTYPE))
+    for _ in range(100):
+        i, agent = rng.randrange(len(meetings)), rng.choice([UNASSIGNED, *range(len(agents))])
+        before = individual.penalty
+        gain = individual.move_gain(i, agent)
+        individual.apply({i: agent})
+        # Exact: both sides are the same integer change in penalty units, divided once
+        assert gain == (before - individual.penalty) / _UNITS_PER_POINT
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_local_search_never_lowers_the_score(seed):
+    agents, meetings = make_instance(seed, num_meetings=80, num_days=2)
+    problem = SchedulingProblem(agents, meetings)
+    rng = random.Random(seed)
+    individual = IncrementalFitness(problem, np.array([rng.choice(eligible) if eligible else UNASSIGNED
+                                                       for eligible in problem.eligible], dtype=GENOME_DTYPE))
+    before = individual.score
+    local_search(individual)
+    assert individual.score >= before
+    assert individual.score == fitness(problem.decode(individual.genome), agents)
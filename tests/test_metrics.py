@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from utils_V5 import AGENTS, SHIFTS, APPOINTMENT_TYPES, MetricsEngine, calculate_metrics
+
+
+def baseline_metrics(schedule, agents=AGENTS):
+    # The original calculate_metrics loop, kept as the reference oracle, with the roster as a parameter
+    metrics = {
+        "shift_distribution": {shift: 0 for shift in SHIFTS},
+        "incorrect_rest_periods": 0,
+        "night_shifts_per_agent": {agent: 0 for agent in agents},
+        "non_security_night_shifts": 0,
+        "incomplete_night_shifts": 0,
+        "skill_utilization": {agent: {skill: 0 for skill in agents[agent]} for agent in agents},
+        "total_appointments": 0,
+        "mismatched_skills": 0
+    }
+
+    for day_index, day_schedule in enumerate(schedule):
+        for agent, shifts in day_schedule.items():
+            for shift in shifts:
+                if shift[0] in SHIFTS:
+                    metrics["shift_distribution"][shift[0]] += 1
+                    if shift[0].startswith("Night"):
+                        metrics["night_shifts_per_agent"][agent] += 0.25  # Count each night segment as 0.25
+                        if "Security" not in agents[agent]:
+                            metrics["non_security_night_shifts"] += 0.25
+                else:  # Appointment
+                    metrics["total_appointments"] += 1
+                    if shift[0] in agents[agent]:
+                        metrics["skill_utilization"][agent][shift[0]] += 1
+                    elif shift[0] != "Monitoring":
+                        metrics["mismatched_skills"] += 1
+
+            if len(shifts) == 4 and all(s[0].startswith("Night") for s in shifts):
+                if "Security" not in agents[agent]:
+                    metrics["non_security_night_shifts"] += 1
+            elif any(s[0].startswith("Night") for s in shifts):
+                metrics["incomplete_night_shifts"] += 1
+
+            if day_index > 0 and "Night4" in [s[0] for s in schedule[day_index - 1][agent]]:
+                if shifts[0][0] == "Morning":
+                    metrics["incorrect_rest_periods"] += 1
+
+    return metrics
+
+
+NIGHTS = ["Night1", "Night2", "Night3", "Night4"]
+
+
+def random_shifts(rng: random.Random):
+    # Full and partial nights, Night4 days, Morning starts and appointments of every kind
+    kind = rng.random()
+    if kind < 0.2:
+        return [(night, 1) for night in NIGHTS]
+    if kind < 0.35:
+        return [(night, 1) for night in rng.sample(NIGHTS, rng.randint(1, 3))]
+    shifts = [(rng.choice(["Morning", "Afternoon"]), 8)]
+    for _ in range(rng.randint(0, 3)):
+        shifts.append((rng.choice(APPOINTMENT_TYPES), rng.randint(1, 3)))
+    return shifts
+
+
+def random_schedule(rng: random.Random, agents, days: int):
+    # Every agent appears every day, as the original loop requires
+    return [{agent: random_shifts(rng) for agent in agents} for _ in range(days)]
+
+
+def random_roster(rng: random.Random, size: int):
+    skills = ["Fire", "Security", "Maintenance"]
+    return {f"Agent{i}": [skill for skill in skills if rng.random() < 0.5] for i in range(size)}
+
+
+def assert_same(result, expected):
+    # repr also checks key order and int vs float, e.g. 0 against 0.0
+    assert repr(result) == repr(expected)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_full_build_matches_baseline(seed):
+    rng = random.Random(seed)
+    schedule = random_schedule(rng, AGENTS, rng.randint(1, 14))
+    assert_same(calculate_metrics(schedule), baseline_metrics(schedule))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_custom_roster_matches_baseline(seed):
+    rng = random.Random(seed)
+    agents = random_roster(rng, rng.randint(1, 12))
+    schedule = random_schedule(rng, agents, rng.randint(1, 10))
+    assert_same(calculate_metrics(schedule, agents), baseline_metrics(schedule, agents))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_updates_match_a_rebuild(seed):
+    rng = random.Random(seed)
+    agents = AGENTS if seed % 2 else random_roster(rng, 6)
+    schedule = random_schedule(rng, agents, 7)
+    engine = MetricsEngine(schedule, agents)
+    for _ in range(30):
+        day, agent = rng.randrange(len(schedule)), rng.choice(list(agents))
+        schedule[day][agent] = random_shifts(rng)
+        engine.update(day, agent, schedule[day][agent])
+        assert_same(engine.metrics(), baseline_metrics(schedule, agents))
+
+
+def test_empty_schedule():
+    assert_same(calculate_metrics([]), baseline_metrics([]))
@@ -1,5 +1,6 @@
 import datetime
-import plotly.figure_factory as ff
+
+import numpy as np
 
 AGENTS = {
     "Agent1": ["Fire", "Security"],
@@ -23,63 +24,150 @@ SHIFTS = {
 SECURITY_AGENTS = [agent for agent, skills in AGENTS.items() if "Security" in skills]
 
 
-def create_calendar_view(schedule):
+def create_calendar_view(schedule, days=None, agents=None):
+    # Only the visible days ((first, stop) day indices) and agents are turned into bars
+    first, stop = days if days is not None else (0, len(schedule))
+    visible = set(agents) if agents is not None else None
+    origin = datetime.datetime(2023, 1, 1)
     df = []
-    for day, day_schedule in enumerate(schedule):
-        for agent, shifts in day_schedule.items():
+    for day in range(max(0, first), min(stop, len(schedule))):
+        date = origin + datetime.timedelta(days=day)
+        for agent, shifts in schedule[day].items():
+            if visible is not None and agent not in visible:
+                continue
             for shift in shifts:
                 if shift[0] in SHIFTS:
                     start, end = SHIFTS[shift[0]]
-                    start_time = datetime.datetime(2023, 1, day + 1, start)
-                    end_time = datetime.datetime(2023, 1, day + 1, end)
+                    start_time = date.replace(hour=start)
+                    end_time = date.replace(hour=end)
                     if end < start:  # For night shifts crossing midnight
                         end_time += datetime.timedelta(days=1)
                 else:  # For appointments
-                    start_time = datetime.datetime(2023, 1, day + 1, SHIFTS[shifts[0][0]][0])
+                    start_time = date.replace(hour=SHIFTS[shifts[0][0]][0])
                     end_time = start_time + datetime.timedelta(hours=shift[1])
                 df.append(dict(Task=agent, Start=start_time, Finish=end_time, Resource=shift[0]))
 
+    # Imported here so metrics-only callers (batch runs, benchmarks) never load Plotly
+    import plotly.figure_factory as ff
     fig = ff.create_gantt(df, index_col='Resource', show_colorbar=True, group_tasks=True)
     fig.update_layout(title='Weekly Schedule', xaxis_title='Day', yaxis_title='Agent')
     return fig
 
 
-def calculate_metrics(schedule):
-    metrics = {
-        "shift_distribution": {shift: 0 for shift in SHIFTS},
-        "incorrect_rest_periods": 0,
-        "night_shifts_per_agent": {agent: 0 for agent in AGENTS},
-        "non_security_night_shifts": 0,
-        "incomplete_night_shifts": 0,
-        "skill_utilization": {agent: {skill: 0 for skill in AGENTS[agent]} for agent in AGENTS},
-        "total_appointments": 0,
-        "mismatched_skills": 0
-    }
-
-    for day_index, day_schedule in enumerate(schedule):
+def _flatten(schedule, first_day=0):
+    # The flat assignments table of a day-by-day {agent: [(shift or appointment, hours)]}
+    # schedule, as (day, agent, slot, name) column lists
+    days, agents, slots, names = [], [], [], []
+    for day, day_schedule in enumerate(schedule, first_day):
         for agent, shifts in day_schedule.items():
-            for shift in shifts:
-                if shift[0] in SHIFTS:
-                    metrics["shift_distribution"][shift[0]] += 1
-                    if shift[0].startswith("Night"):
-                        metrics["night_shifts_per_agent"][agent] += 0.25  # Count each night segment as 0.25
-                        if "Security" not in AGENTS[agent]:
-                            metrics["non_security_night_shifts"] += 0.25
-                else:  # Appointment
-                    metrics["total_appointments"] += 1
-                    if shift[0] in AGENTS[agent]:
-                        metrics["skill_utilization"][agent][shift[0]] += 1
-                    elif shift[0] != "Monitoring":
-                        metrics["mismatched_skills"] += 1
-
-            if len(shifts) == 4 and all(s[0].startswith("Night") for s in shifts):
-                if "Security" not in AGENTS[agent]:
-                    metrics["non_security_night_shifts"] += 1
-            elif any(s[0].startswith("Night") for s in shifts):
-                metrics["incomplete_night_shifts"] += 1
-
-            if day_index > 0 and "Night4" in [s[0] for s in schedule[day_index - 1][agent]]:
-                if shifts[0][0] == "Morning":
-                    metrics["incorrect_rest_periods"] += 1
-
-    return metrics
\ No newline at end of file
+            count = len(shifts)
+            days.extend([day] * count)
+            agents.extend([agent] * count)
+            slots.extend(range(count))
+            names.extend([shift[0] for shift in shifts])
+    return days, agents, slots, names
+
+
+class MetricsEngine:
+    # `calculate_metrics` over the flat assignments. Every counter is summed into a
+    # (day, agent, counter) grid with bincount; `update` rewrites the cells of one agent-day and
+    # `metrics` reduces the grid, so small edits never revisit the whole schedule.
+    def __init__(self, schedule, agents=None):
+        self.agents = agents if agents is not None else AGENTS
+        self.skills = sorted({skill for skills in self.agents.values() for skill in skills})
+        self.columns = (["size", "night_name", "night_segment", "appointment", "mismatched", "night4",
+                         "first_morning"] + [f"shift:{shift}" for shift in SHIFTS] +
+                        [f"skill:{skill}" for skill in self.skills])
+        self._column = {column: i for i, column in enumerate(self.columns)}
+        self.agent_index = {agent: i for i, agent in enumerate(self.agents)}
+        self.grid = np.zeros((len(schedule), len(self.agent_index), len(self.columns)), dtype=np.int64)
+        self._add(_flatten(schedule))
+
+    def _agent(self, agent):
+        # Agents missing from the roster get a column of their own (no skills, not Security)
+        if agent not in self.agent_index:
+            self.agent_index[agent] = len(self.agent_index)
+            self.grid = np.concatenate((self.grid, np.zeros_like(self.grid[:, :1])), axis=1)
+        return self.agent_index[agent]
+
+    def _add(self, rows):
+        days, agents, slots, names = rows
+        if not days:
+            return
+        agent_codes = np.array([self._agent(agent) for agent in agents], dtype=np.intp)
+        codes = {}
+        name_codes = np.array([codes.setdefault(name, len(codes)) for name in names], dtype=np.intp)
+        unique_names = list(codes)
+        name_array = np.array(unique_names, dtype=object)
+
+        # Features depend on the name alone, except skill matches, which need the agent too
+        is_shift = np.array([name in SHIFTS for name in unique_names])
+        night_name = np.array([name.startswith("Night") for name in unique_names])
+        skill_of = np.array([self.skills.index(name) if name in self.skills else -1 for name in unique_names])
+        roster = list(self.agent_index)
+        knows = np.array([[name in self.agents.get(agent, ()) for name in unique_names] for agent in roster],
+                         dtype=bool).reshape(len(roster), len(unique_names))
+
+        appointment = ~is_shift[name_codes]
+        matched = appointment & knows[agent_codes, name_codes]
+        features = {
+            "size": np.ones(len(days), dtype=bool),
+            "night_name": night_name[name_codes],
+            "night_segment": (is_shift & night_name)[name_codes],
+            "appointment": appointment,
+            "mismatched": appointment & ~matched & (name_array != "Monitoring")[name_codes],
+            "night4": (name_array == "Night4")[name_codes],
+            "first_morning": (np.array(slots) == 0) & (name_array == "Morning")[name_codes],
+        }
+        for shift in SHIFTS:
+            features[f"shift:{shift}"] = (name_array == shift)[name_codes]
+        for k, skill in enumerate(self.skills):
+            features[f"skill:{skill}"] = matched & (skill_of[name_codes] == k)
+
+        cells = np.array(days, dtype=np.intp) * self.grid.shape[1] + agent_codes
+        flat = self.grid.reshape(-1, len(self.columns))
+        for column, values in features.items():
+            flat[:, self._column[column]] += np.bincount(cells, weights=values, minlength=len(flat)).astype(np.int64)
+
+    def update(self, day, agent, shifts):
+        # Replaces one agent's shifts on one day
+        if day >= len(self.grid):
+            self.grid = np.concatenate((self.grid, np.zeros((day + 1 - len(self.grid),) + self.grid.shape[1:],
+                                                            dtype=self.grid.dtype)))
+        self.grid[day, self._agent(agent)] = 0
+        self._add(_flatten([{agent: shifts}], day))
+
+    def metrics(self):
+        grid, column = self.grid, self._column
+        per_agent = grid.sum(axis=0)
+        totals = per_agent.sum(axis=0)
+        size, night_name = grid[..., column["size"]], grid[..., column["night_name"]]
+        full_night = (size == 4) & (night_name == size)
+        security = np.array(["Security" in self.agents.get(agent, ()) for agent in self.agent_index], dtype=bool)
+        # Night4 on day d - 1 followed by a Morning shift starting day d
+        rest = (grid[:-1, :, column["night4"]] > 0) & (grid[1:, :, column["first_morning"]] > 0)
+
+        def quarters(count):
+            # Night segments count 0.25 each; untouched counters stay integer 0 as in the original
+            return int(count) * 0.25 if count else 0
+
+        def agent_total(agent, name):
+            return int(per_agent[self.agent_index[agent], column[name]])
+
+        return {
+            "shift_distribution": {shift: int(totals[column[f"shift:{shift}"]]) for shift in SHIFTS},
+            "incorrect_rest_periods": int(rest.sum()),
+            "night_shifts_per_agent": {agent: quarters(agent_total(agent, "night_segment")) for agent in self.agents},
+            "non_security_night_shifts": quarters(per_agent[~security, column["night_segment"]].sum()) +
+                                         int((full_night & ~security).sum()),
+            "incomplete_night_shifts": int(((night_name > 0) & ~full_night).sum()),
+            "skill_utilization": {agent: {skill: agent_total(agent, f"skill:{skill}") for skill in skills}
+                                  for agent, skills in self.agents.items()},
+            "total_appointments": int(totals[column["appointment"]]),
+            "mismatched_skills": int(totals[column["mismatched"]]),
+        }
+
+
+def calculate_metrics(schedule, agents=None):
+    # `agents` is an {agent: [skills]} roster, AGENTS by default
+    return MetricsEngine(schedule, agents).metrics()